@@ -0,0 +1,455 @@
+"""Benchmarks for the core hot paths, with JSON output and baseline comparison.
+
+Run the suite and store the results::
+
+    python -m gem_bench run --output baseline.json
+
+Compare a later run against the stored baseline::
+
+    python -m gem_bench run --output current.json
+    python -m gem_bench compare baseline.json current.json --threshold 0.10
+
+Every benchmark uses fixed seeds and fixed inputs, so two runs on the same
+machine differ only by timing noise. Only the standard library is used.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import core
+from core import (
+    DEFAULT_LADDER,
+    GEM_CATALOG,
+    SIZE_MODIFIERS,
+    BatchRequest,
+    CutPolicy,
+    DiceSource,
+    RetainerRequest,
+    RetainerState,
+    SuperbPolicy,
+    cutter_adjustment,
+    hire_retainer,
+)
+
+BENCH_SEED = 20240601
+DEFAULT_SCALES = (1, 1_000, 100_000, 1_000_000)
+QUICK_SCALES = (1, 1_000)
+DEFAULT_THRESHOLD = 0.10
+MIN_SAMPLE_S = 0.05
+SKILLS = ("Unappraised", "Shaky", "Fair", "Good", "Superb")
+SCHEMA_VERSION = 1
+DICE_ROLLS = 10_000
+DICE_BATCH_GEMS = 1_000
+
+Benchmark = Tuple[str, Callable[[], object], int, str]
+
+
+# ------------------------
+# TIMING
+# ------------------------
+def calibrate(timer: timeit.Timer, min_sample_s: float = MIN_SAMPLE_S) -> int:
+    """Return a call count for which one sample of ``timer`` takes at least ``min_sample_s``."""
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_sample_s:
+            return number
+        number *= 2
+
+
+def measure(func: Callable[[], object], *, ops: int, repeat: int, number: Optional[int] = None) -> Dict[str, float]:
+    """Time ``func`` and report the best and median seconds per operation.
+
+    ``ops`` is how many operations one call of ``func`` performs. When
+    ``number`` is omitted the call count per sample is calibrated so each
+    sample takes at least ``MIN_SAMPLE_S``.
+    """
+    timer = timeit.Timer(func)
+    if number is None:
+        number = calibrate(timer)
+    samples = [t / (number * ops) for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "best_s": min(samples),
+        "median_s": statistics.median(samples),
+        "ops": ops,
+        "calls": number,
+        "repeat": repeat,
+    }
+
+
+# ------------------------
+# MICRO BENCHMARKS
+# ------------------------
+def _sample_values(count: int) -> List[int]:
+    rng = random.Random(BENCH_SEED)
+    top = DEFAULT_LADDER.values[-1]
+    return [rng.randint(1, top // 10) for _ in range(count)]
+
+
+def micro_benchmarks() -> List[Benchmark]:
+    values = _sample_values(1_000)
+    bands = [DEFAULT_LADDER.band(v) for v in values]
+    below_cap = [v % core.CUTTING_CAP_SP or 1 for v in values]
+    descriptions = sorted({entry.color for entry in GEM_CATALOG.entries})
+    benches: List[Benchmark] = []
+
+    def bench_adjust_value() -> None:
+        rng = random.Random(BENCH_SEED)
+        for value, (low, high) in zip(values, bands):
+            core.adjust_value(value, low, high, rng=rng)
+
+    benches.append(("adjust_value", bench_adjust_value, len(values), "call"))
+
+    for skill, sides in (("Shaky", 12), ("Fair", 12), ("Good", 12), ("Superb", 20)):
+
+        def bench_cut(skill: str = skill, sides: int = sides) -> None:
+            rng = random.Random(BENCH_SEED)
+            for value, (low, high) in zip(below_cap, bands):
+                cutter_adjustment(
+                    value,
+                    cutter_type_name="Dwarf",
+                    skill_bonus=20,
+                    min_rung_sp=low,
+                    max_rung_sp=high,
+                    fixed_skill_level=skill,
+                    fixed_dice_sides=sides,
+                    gem_index=1,
+                    gem_name="Bench",
+                    rng=rng,
+                )
+
+        benches.append((f"cutter_adjustment[skill={skill}]", bench_cut, len(below_cap), "call"))
+
+    def bench_colors_warm() -> None:
+        for desc in descriptions:
+            core.infer_color_notes_from_description(desc)
+
+    def bench_colors_cold() -> None:
+        core._infer_colors.cache_clear()
+        for desc in descriptions:
+            core.infer_color_notes_from_description(desc)
+
+    benches.append(("infer_color_notes_from_description[cached]", bench_colors_warm, len(descriptions), "call"))
+    benches.append(("infer_color_notes_from_description[uncached]", bench_colors_cold, len(descriptions), "call"))
+
+    for label, make_dice in (("random.Random", random.Random), ("DiceSource", DiceSource)):
+        for sides in (10, 20, 100):
+
+            def bench_dice(make_dice: Callable[[int], object] = make_dice, sides: int = sides) -> None:
+                randint = make_dice(BENCH_SEED).randint
+                for _ in range(DICE_ROLLS):
+                    randint(1, sides)
+
+            benches.append((f"randint[d{sides},{label}]", bench_dice, DICE_ROLLS, "call"))
+
+    for name in ("floor_rung", "rung_index_of", "next_rung", "prev_rung", "previous_ladder_rung", "rung_band"):
+        helper = getattr(core, name)
+
+        def bench_rung(helper: Callable[[int], object] = helper) -> None:
+            for value in values:
+                helper(value)
+
+        benches.append((name, bench_rung, len(values), "call"))
+
+    return benches
+
+
+# ------------------------
+# END-TO-END BENCHMARKS
+# ------------------------
+def _retainer_for(skill: str) -> RetainerState:
+    if skill == "Unappraised":
+        return RetainerState()
+    request = RetainerRequest(race="Dwarf", months=1, knows_skill_level=True, known_skill_level=skill)
+    return hire_retainer(RetainerState(), request, rng=random.Random(BENCH_SEED)).state
+
+
+def _always_cut(_ctx) -> bool:
+    return True
+
+
+def _single_superb_roll(_step) -> bool:
+    return False
+
+
+def _superb_to_cap(_step) -> bool:
+    return True
+
+
+def _batch_name(scale: int, cat_number: int, size_label: str, skill: str) -> str:
+    return f"process_batch[n={scale},cat={cat_number},size={size_label},skill={skill}]"
+
+
+def batch_benchmarks(scales: Sequence[int], name_filter: Optional[str] = None) -> Iterator[Benchmark]:
+    """One ``process_batch`` case per gem count, category, size and skill level.
+
+    Plans are rolled once per category from a fixed seed; appraised gems are
+    always cut and Superb cutters stop after one roll. Cases are generated
+    lazily and plan lists are only built for categories with a case matching
+    ``name_filter``, so each large list can be freed once its cases have run.
+    """
+    for scale in scales:
+        for cat_number, category in enumerate(GEM_CATALOG.categories, start=1):
+            names = [
+                _batch_name(scale, cat_number, size_label, skill) for size_label in SIZE_MODIFIERS for skill in SKILLS
+            ]
+            if name_filter and not any(name_filter in name for name in names):
+                continue
+            entry_plans = [entry.plan() for entry in GEM_CATALOG.in_category(category)]
+            plan_rng = random.Random(BENCH_SEED + cat_number)
+            plans = [entry_plans[plan_rng.randrange(len(entry_plans))] for _ in range(scale)]
+            for size_label, size_modifier in SIZE_MODIFIERS.items():
+                for skill in SKILLS:
+                    name = _batch_name(scale, cat_number, size_label, skill)
+                    if name_filter and name_filter not in name:
+                        continue
+                    retainer = _retainer_for(skill)
+                    request = BatchRequest(
+                        batch_size=scale,
+                        category=category,
+                        size_label=size_label,
+                        size_modifier=size_modifier,
+                        gem_plans=plans,
+                        appraise=skill != "Unappraised",
+                    )
+
+                    def bench_batch(retainer: RetainerState = retainer, request: BatchRequest = request) -> None:
+                        core.process_batch(
+                            retainer,
+                            request,
+                            rng=random.Random(BENCH_SEED),
+                            cut_decision_provider=_always_cut,
+                            superb_decision_provider=_single_superb_roll,
+                        )
+
+                    yield name, bench_batch, scale, "gem"
+
+
+def dice_benchmarks() -> List[Benchmark]:
+    """Per-gem cost of ``process_batch`` with ``random.Random`` versus :class:`DiceSource` dice."""
+    benches: List[Benchmark] = []
+    category = GEM_CATALOG.categories[2]
+    entries = GEM_CATALOG.in_category(category)
+    plans = [entries[i % len(entries)].plan() for i in range(DICE_BATCH_GEMS)]
+    for skill in ("Good", "Superb"):
+        retainer = _retainer_for(skill)
+        request = BatchRequest(
+            batch_size=len(plans),
+            category=category,
+            size_label="Average",
+            size_modifier=1.0,
+            gem_plans=plans,
+            appraise=True,
+        )
+        for label, make_dice in (("random.Random", random.Random), ("DiceSource", DiceSource)):
+
+            def bench_batch(
+                retainer: RetainerState = retainer,
+                request: BatchRequest = request,
+                make_dice: Callable[[int], object] = make_dice,
+            ) -> None:
+                core.process_batch(
+                    retainer,
+                    request,
+                    rng=make_dice(BENCH_SEED),
+                    cut_decision_provider=_always_cut,
+                    superb_decision_provider=_superb_to_cap,
+                )
+
+            benches.append((f"process_batch[dice={label},skill={skill}]", bench_batch, len(plans), "gem"))
+    return benches
+
+
+def sampler_benchmarks() -> List[Benchmark]:
+    """Per-gem cost of rolling every appraisal and Superb chain versus sampling or counting outcomes."""
+    benches: List[Benchmark] = []
+    category = GEM_CATALOG.categories[2]
+    entries = GEM_CATALOG.in_category(category)
+    plans = [entries[i % len(entries)].plan() for i in range(DICE_BATCH_GEMS)]
+    retainer = _retainer_for("Superb")
+    request = BatchRequest(
+        batch_size=len(plans),
+        category=category,
+        size_label="Average",
+        size_modifier=1.0,
+        gem_plans=plans,
+        appraise=True,
+    )
+
+    def bench_loop() -> None:
+        core.process_batch(
+            retainer,
+            request,
+            rng=DiceSource(BENCH_SEED),
+            cut_decision_provider=CutPolicy(),
+            superb_decision_provider=SuperbPolicy(),
+        )
+
+    def bench_sampled() -> None:
+        core.process_batch_sampled(
+            retainer,
+            request,
+            rng=DiceSource(BENCH_SEED),
+            cut_policy=CutPolicy(),
+            superb_policy=SuperbPolicy(),
+        )
+
+    def bench_aggregate() -> None:
+        core.process_batch_aggregate(
+            retainer,
+            request,
+            rng=DiceSource(BENCH_SEED),
+            cut_policy=CutPolicy(),
+            superb_policy=SuperbPolicy(),
+        )
+
+    benches.append(("process_batch[chains=rolled,skill=Superb]", bench_loop, len(plans), "gem"))
+    benches.append(("process_batch_sampled[chains=alias,skill=Superb]", bench_sampled, len(plans), "gem"))
+    benches.append(("process_batch_aggregate[chains=multinomial,skill=Superb]", bench_aggregate, len(plans), "gem"))
+    return benches
+
+
+def _repeat_for(ops: int, unit: str) -> Tuple[int, Optional[int]]:
+    if unit != "gem" or ops <= 1_000:
+        return 5, None
+    if ops <= 100_000:
+        return 3, 1
+    return 1, 1
+
+
+def run_suite(
+    scales: Sequence[int],
+    *,
+    name_filter: Optional[str] = None,
+    log: Callable[[str], None] = lambda _line: None,
+) -> dict:
+    fixed = micro_benchmarks() + dice_benchmarks() + sampler_benchmarks()
+    if name_filter:
+        fixed = [bench for bench in fixed if name_filter in bench[0]]
+    benches = itertools.chain(fixed, batch_benchmarks(scales, name_filter))
+
+    results: Dict[str, dict] = {}
+    for name, func, ops, unit in benches:
+        repeat, number = _repeat_for(ops, unit)
+        stats = measure(func, ops=ops, repeat=repeat, number=number)
+        stats["unit"] = unit
+        results[name] = stats
+        log(f"{name:<80} {stats['best_s'] * 1e6:12.3f} us/{unit}")
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "seed": BENCH_SEED,
+        "scales": list(scales),
+        "results": results,
+    }
+
+
+# ------------------------
+# COMPARISON
+# ------------------------
+def compare_results(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[str], List[str]]:
+    """Compare best times per benchmark; return (report lines, names that regressed)."""
+    lines: List[str] = []
+    regressions: List[str] = []
+    base_results = baseline.get("results", {})
+    cur_results = current.get("results", {})
+
+    for name in sorted(set(base_results) & set(cur_results)):
+        before = base_results[name]["best_s"]
+        after = cur_results[name]["best_s"]
+        change = after / before - 1.0 if before > 0 else 0.0
+        status = ""
+        if change > threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            status = "faster"
+        unit = cur_results[name].get("unit", "op")
+        lines.append(f"{name:<80} {before * 1e6:12.3f} -> {after * 1e6:12.3f} us/{unit} {change:+8.1%} {status}")
+
+    for name in sorted(set(base_results) - set(cur_results)):
+        lines.append(f"{name:<80} missing from current run")
+    for name in sorted(set(cur_results) - set(base_results)):
+        lines.append(f"{name:<80} new (no baseline)")
+    return lines, regressions
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _parse_scales(text: str) -> Tuple[int, ...]:
+    try:
+        scales = tuple(int(float(part)) for part in text.split(",") if part.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError("scales must be a comma-separated list of gem counts") from None
+    if not scales or min(scales) < 1:
+        raise argparse.ArgumentTypeError("scales must be positive gem counts")
+    return scales
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m gem_bench", description="Benchmark the gem core hot paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write JSON results")
+    run_parser.add_argument("-o", "--output", default="-", help="Write JSON results here (default: stdout)")
+    run_parser.add_argument(
+        "--scales",
+        type=_parse_scales,
+        default=DEFAULT_SCALES,
+        help="Comma-separated gem counts for the process_batch matrix (default: 1,1e3,1e5,1e6)",
+    )
+    run_parser.add_argument("--quick", action="store_true", help="Only run the 1 and 1,000 gem batch scales")
+    run_parser.add_argument("--filter", dest="name_filter", default=None, help="Only run benchmarks whose name contains this text")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a baseline results file")
+    compare_parser.add_argument("baseline", help="Baseline JSON results")
+    compare_parser.add_argument("current", help="Current JSON results")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown that counts as a regression (default: 0.10)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.command == "compare":
+        lines, regressions = compare_results(_load(args.baseline), _load(args.current), args.threshold)
+        for line in lines:
+            print(line)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}.")
+            return 1
+        return 0
+
+    scales = QUICK_SCALES if args.quick else args.scales
+    report = run_suite(scales, name_filter=args.name_filter, log=lambda line: print(line, file=sys.stderr))
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
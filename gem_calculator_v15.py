@@ -2,31 +2,50 @@
 from __future__ import annotations
 
 import argparse
+import json
 import random
-from typing import Callable, List, Optional
+import sys
+from typing import Callable, Iterable, List, Optional, Sequence, TextIO
 
 from core import (
     CUTTING_CAP_SP,
     CUTTER_TYPES,
-    GEMS,
+    GEM_CATALOG,
+    POLICY_QUALITIES,
     SIZE_MODIFIERS,
+    BatchCheckpoint,
+    BatchObserver,
     BatchRequest,
+    BatchTotals,
+    Checkpointer,
+    CutPolicy,
+    AggregateGroup,
+    GemEntry,
     GemPlan,
     GemAppraisalContext,
     GemStartContext,
     RetainerRequest,
     RetainerState,
+    SuperbPolicy,
+    SimulationResult,
     SuperbRollStep,
     gp,
     to_sp,
     hire_retainer,
+    iter_batch,
+    iter_batch_checkpointed,
+    load_checkpoint,
     process_batch,
+    process_batch_aggregate,
+    process_batch_parallel,
     roll_for_category,
     roll_for_gem,
     select_batch_count,
+    simulate,
     choose_size,
 )
 
+PROGRESS_INTERVAL_MS = 500
 
 # ------------------------
 # CLI UTILITIES
@@ -85,7 +104,7 @@ def prompt_batch_count() -> int:
     idx = safe_int_choice("Choice: ", 1, 4)
     custom = None
     if idx == 4:
-        custom = safe_int_choice("Enter a positive number (1–999): ", 1, 999)
+        custom = safe_int_choice("Enter a positive number: ", 1, sys.maxsize)
     return select_batch_count(idx, custom)
 
 
@@ -100,7 +119,7 @@ def prompt_size_choice() -> tuple[str, float]:
 
 
 def prompt_category(rng: random.Random) -> str:
-    categories = list(GEMS.keys())
+    categories = list(GEM_CATALOG.categories)
     print("\nSelect gem category (applies to the whole batch):")
     if yes_no("Roll randomly for gem category using d%? (Y/N) "):
         category, roll = roll_for_category(categories, rng=rng)
@@ -115,59 +134,58 @@ def prompt_category(rng: random.Random) -> str:
 
 
 def prompt_gem_selection(
-    gems_list: List[tuple[str, str, float]],
+    gems_list: Sequence[GemEntry],
     rng: random.Random,
 ) -> tuple[int, bool]:
     if yes_no("Roll randomly for a specific gem in this category? (Y/N) "):
         index, roll = roll_for_gem(gems_list, rng=rng)
-        name, color, _ = gems_list[index]
-        print(f"[Gem Roll] d{len(gems_list)} = {roll} → {name} ({color})")
+        entry = gems_list[index]
+        print(f"[Gem Roll] d{len(gems_list)} = {roll} → {entry.name} ({entry.color})")
         return index, True
 
-    for i, (name, color, _) in enumerate(gems_list, start=1):
-        print(f" {i}. {name} ({color})")
+    for i, entry in enumerate(gems_list, start=1):
+        print(f" {i}. {entry.name} ({entry.color})")
     idx = safe_int_choice("Choice: ", 1, len(gems_list)) - 1
-    name, color, _ = gems_list[idx]
-    print(f"[Chosen] {name} ({color})")
+    entry = gems_list[idx]
+    print(f"[Chosen] {entry.name} ({entry.color})")
     return idx, False
 
 
 def collect_gem_plans(
     batch_size: int,
-    gems_list: List[tuple[str, str, float]],
+    gems_list: Sequence[GemEntry],
     rng: random.Random,
     mixed: bool,
 ) -> List[GemPlan]:
     plans: List[GemPlan] = []
     if not mixed:
         index, _ = prompt_gem_selection(gems_list, rng)
-        name, color, base_gp = gems_list[index]
-        plans = [GemPlan(name, color, base_gp) for _ in range(batch_size)]
+        plan = gems_list[index].plan()
+        plans = [plan] * batch_size
         return plans
 
     auto_roll_each = yes_no("Roll randomly for EACH gem in this batch? (Y/N) ")
     if not auto_roll_each:
         print(f"\nGems available in this category:")
-        for i, (name, color, _) in enumerate(gems_list, start=1):
-            print(f" {i}. {name} ({color})")
+        for i, entry in enumerate(gems_list, start=1):
+            print(f" {i}. {entry.name} ({entry.color})")
 
     for gi in range(batch_size):
         print(f"\nSelecting gem {gi + 1} of {batch_size}")
         if auto_roll_each:
             idx, roll = roll_for_gem(gems_list, rng=rng)
-            name, color, _ = gems_list[idx]
-            print(f"[Gem Roll] d{len(gems_list)} = {roll} → {name} ({color})")
+            entry = gems_list[idx]
+            print(f"[Gem Roll] d{len(gems_list)} = {roll} → {entry.name} ({entry.color})")
         else:
             if yes_no("Roll randomly for THIS gem? (Y/N) "):
                 idx, roll = roll_for_gem(gems_list, rng=rng)
-                name, color, _ = gems_list[idx]
-                print(f"[Gem Roll] d{len(gems_list)} = {roll} → {name} ({color})")
+                entry = gems_list[idx]
+                print(f"[Gem Roll] d{len(gems_list)} = {roll} → {entry.name} ({entry.color})")
             else:
                 idx = safe_int_choice(f"Choose gem index (1-{len(gems_list)}): ", 1, len(gems_list)) - 1
-                name, color, _ = gems_list[idx]
-                print(f"[Chosen] {name} ({color})")
-        _, _, base_gp = gems_list[idx]
-        plans.append(GemPlan(name, color, base_gp))
+                entry = gems_list[idx]
+                print(f"[Chosen] {entry.name} ({entry.color})")
+        plans.append(entry.plan())
     return plans
 
 
@@ -192,6 +210,16 @@ def handle_appraisal(ctx: GemAppraisalContext) -> None:
             print(f" - {color}: {note}")
 
 
+def make_progress_observer(total: int) -> BatchObserver:
+    def report(chunk, totals: BatchTotals) -> None:
+        print(
+            f"[Progress] {totals.gem_count:,} / {total:,} gem(s) processed; "
+            f"running value {gp(totals.total_final_value_sp)}; ruined {totals.ruined_count}"
+        )
+
+    return BatchObserver(report, every_ms=PROGRESS_INTERVAL_MS)
+
+
 def make_cut_decision_provider(auto_cut_all: bool) -> Callable[[GemAppraisalContext], bool]:
     def provider(ctx: GemAppraisalContext) -> bool:
         if not ctx.appraisal.rolls:
@@ -280,14 +308,14 @@ def display_batch_summary(batch_result) -> None:
             print(f"  Gem {rec.index:>2} — {rec.plan.name}: Ruined{note}")
 
 
-def run_cli() -> None:
-    rng = random.Random()
+def run_cli(workers: int = 1, seed: Optional[int] = None) -> None:
+    rng = random.Random(seed)
     retainer = RetainerState()
 
     while True:
         batch_n = prompt_batch_count()
         category = prompt_category(rng)
-        gems_list = list(GEMS[category])
+        gems_list = GEM_CATALOG.in_category(category)
 
         print("\nGems for this batch can be identical or vary per item.")
         mixed_gems = yes_no("Allow different gems within this batch (same category)? (Y/N) ")
@@ -297,7 +325,7 @@ def run_cli() -> None:
         plans = collect_gem_plans(batch_n, gems_list, rng, mixed_gems)
 
         if not mixed_gems:
-            base_sp = to_sp(plans[0].base_gp * size_mod)
+            base_sp = GEM_CATALOG[plans[0].gem_id].base_sp_by_size[size_label]
             print(f"\n== Starting batch of {batch_n} gem(s) ==")
             print(f"Category: {category}")
             print(f"Gem (same for all): {plans[0].name} ({plans[0].color})")
@@ -364,15 +392,30 @@ def run_cli() -> None:
             appraise=did_appraisal_batch,
         )
 
-        result = process_batch(
-            retainer,
-            batch_request,
-            rng=rng,
-            on_gem_start=handle_gem_start,
-            on_appraisal=handle_appraisal,
-            cut_decision_provider=cut_provider,
-            superb_decision_provider=superb_provider,
-        )
+        # Worker processes cannot prompt, so only batches without per-gem questions run in parallel.
+        # They all go through process_batch_parallel so a seed gives the same gems for any --workers.
+        needs_prompts = did_appraisal_batch and (not auto_cut_all or retainer.skill_level == "Superb")
+        if not needs_prompts:
+            if workers > 1:
+                print(f"Processing {batch_n} gem(s) across {workers} worker processes...")
+            result = process_batch_parallel(
+                retainer,
+                batch_request,
+                seed=rng.getrandbits(64),
+                workers=workers,
+                cut_decision_provider=CutPolicy() if did_appraisal_batch else None,
+                observer=make_progress_observer(batch_n),
+            )
+        else:
+            result = process_batch(
+                retainer,
+                batch_request,
+                rng=rng,
+                on_gem_start=handle_gem_start,
+                on_appraisal=handle_appraisal,
+                cut_decision_provider=cut_provider,
+                superb_decision_provider=superb_provider,
+            )
 
         for gem_result in result.gem_results:
             display_gem_results(result.request, gem_result, result.retainer_usage)
@@ -385,20 +428,513 @@ def run_cli() -> None:
             break
 
 
+# ------------------------
+# HEADLESS BATCH MODE
+# ------------------------
+class JobError(ValueError):
+    """Raised when a job line in a headless job file is invalid."""
+
+
+def resolve_category(spec, rng: random.Random) -> str:
+    categories = list(GEM_CATALOG.categories)
+    if spec == "roll":
+        category, _ = roll_for_category(categories, rng=rng)
+        return category
+    if isinstance(spec, int) and not isinstance(spec, bool):
+        if 1 <= spec <= len(categories):
+            return categories[spec - 1]
+        raise JobError(f"category index must be between 1 and {len(categories)}")
+    if isinstance(spec, str):
+        if spec in categories:
+            return spec
+        matches = [cat for cat in categories if spec.lower() in cat.lower()]
+        if len(matches) == 1:
+            return matches[0]
+    raise JobError(f"unknown or ambiguous category: {spec!r}")
+
+
+def resolve_gem(name: str, category: str) -> GemEntry:
+    entry = GEM_CATALOG.by_name(name)
+    if entry is None or entry.category != category:
+        raise JobError(f"gem {name!r} is not in category {category!r}")
+    return entry
+
+
+def build_job_plans(spec: dict, category: str, rng: random.Random) -> List[GemPlan]:
+    gems = spec.get("gems", "roll")
+    gems_list = GEM_CATALOG.in_category(category)
+    if isinstance(gems, list):
+        if not gems:
+            raise JobError("gems list must not be empty")
+        return [resolve_gem(name, category).plan() for name in gems]
+
+    count = spec.get("count")
+    if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+        raise JobError("count must be a positive integer unless gems is a list")
+    if gems == "roll each":
+        return [gems_list[roll_for_gem(gems_list, rng=rng)[0]].plan() for _ in range(count)]
+    if gems == "roll":
+        entry = gems_list[roll_for_gem(gems_list, rng=rng)[0]]
+    elif isinstance(gems, str):
+        entry = resolve_gem(gems, category)
+    else:
+        raise JobError("gems must be a list of names, a gem name, 'roll' or 'roll each'")
+    return [entry.plan()] * count
+
+
+def gem_result_record(job_id, result) -> dict:
+    outcome = result.cutter_outcome
+    return {
+        "type": "gem",
+        "job": job_id,
+        "index": result.index,
+        "gem": result.plan.name,
+        "color": result.plan.color,
+        "size": result.size_label,
+        "base_value_sp": result.appraisal.base_value_sp,
+        "adjusted_value_sp": result.appraisal.adjusted_value_sp,
+        "quality": result.appraisal.quality_label,
+        "rolls": result.appraisal.rolls,
+        "cut": outcome.performed,
+        "cut_result": outcome.result_text,
+        "cut_die_roll": outcome.die_roll,
+        "superb_rolls": [step.roll for step in outcome.superb_steps],
+        "ruined_prev_rung_sp": outcome.ruined_prev_rung_sp,
+        "surcharge_sp": result.surcharge_sp,
+        "final_value_sp": result.final_value_sp,
+    }
+
+
+def group_record(job_id, group: AggregateGroup) -> dict:
+    return {
+        "type": "group",
+        "job": job_id,
+        "gem": group.plan.name,
+        "color": group.plan.color,
+        "count": group.count,
+        "base_value_sp": group.base_value_sp,
+        "value_counts": [[value, count] for value, count in group.value_counts.items()],
+        "ruined": group.ruined_count,
+        "total_final_value_sp": group.total_final_value_sp,
+        "total_surcharge_sp": group.total_surcharge_sp,
+    }
+
+
+def run_job(
+    job_id,
+    spec: dict,
+    rng: random.Random,
+    write: Callable[[dict], None],
+    *,
+    checkpointer: Optional[Checkpointer] = None,
+    resume: Optional[BatchCheckpoint] = None,
+    checkpoint_extra: Optional[Callable[[], dict]] = None,
+) -> None:
+    """Run one job spec, writing its records; with a ``checkpointer`` detailed batches save checkpoints as they go.
+
+    ``resume`` continues the batch from a checkpoint taken during this same
+    job; the setup rolls are repeated from ``rng`` so it must be in the
+    state it had when the job first started.
+    """
+    if not isinstance(spec, dict):
+        raise JobError("each job must be a JSON object")
+    seed = spec.get("seed")
+    job_rng = random.Random(seed) if seed is not None else random.Random(rng.getrandbits(64))
+
+    category = resolve_category(spec.get("category", "roll"), job_rng)
+    size_label = spec.get("size", "Average")
+    if size_label not in SIZE_MODIFIERS:
+        raise JobError(f"unknown size: {size_label!r}")
+    plans = build_job_plans(spec, category, job_rng)
+
+    retainer = RetainerState()
+    retainer_spec = spec.get("retainer")
+    if retainer_spec is not None:
+        skill = retainer_spec.get("skill")
+        retainer = hire_retainer(
+            retainer,
+            RetainerRequest(
+                race=retainer_spec.get("race", "Normal"),
+                months=retainer_spec.get("months", 1),
+                knows_skill_level=skill is not None,
+                known_skill_level=skill,
+            ),
+            rng=job_rng,
+        ).state
+    appraise = bool(spec.get("appraise", retainer.active))
+
+    cut_provider = CutPolicy() if appraise and spec.get("auto_cut", False) else None
+    if "cut_policy" in spec:
+        cut_provider = CutPolicy.from_dict(spec["cut_policy"])
+    superb_stop = spec.get("superb_stop") or {}
+    if superb_stop == "optimal":
+        superb_provider = SuperbPolicy(optimal=True)
+    elif isinstance(superb_stop, dict):
+        target_gp = superb_stop.get("target_gp")
+        # As with simulate, the one-roll default only applies when no target is given.
+        superb_provider = SuperbPolicy(
+            stop_at_value_sp=None if target_gp is None else to_sp(target_gp),
+            max_rolls=superb_stop.get("max_rolls", 1 if target_gp is None else None),
+        )
+    else:
+        raise JobError("superb_stop must be an object or 'optimal'")
+    if "superb_policy" in spec:
+        superb_provider = SuperbPolicy.from_dict(spec["superb_policy"])
+    detail = spec.get("detail", True)
+    if not isinstance(detail, bool):
+        raise JobError("detail must be true or false")
+
+    request = BatchRequest(
+        batch_size=len(plans),
+        category=category,
+        size_label=size_label,
+        size_modifier=SIZE_MODIFIERS[size_label],
+        gem_plans=plans,
+        appraise=appraise,
+    )
+    totals = BatchTotals()
+    if detail:
+        if checkpointer is not None:
+            results = iter_batch_checkpointed(
+                retainer,
+                request,
+                rng=job_rng,
+                checkpointer=checkpointer,
+                resume=resume,
+                totals=totals,
+                extra=checkpoint_extra,
+                cut_decision_provider=cut_provider,
+                superb_decision_provider=superb_provider,
+            )
+        else:
+            results = iter_batch(
+                retainer,
+                request,
+                totals=totals,
+                rng=job_rng,
+                cut_decision_provider=cut_provider,
+                superb_decision_provider=superb_provider,
+            )
+        for result in results:
+            write(gem_result_record(job_id, result))
+    else:
+        aggregate = process_batch_aggregate(
+            retainer,
+            request,
+            rng=job_rng,
+            cut_policy=cut_provider,
+            superb_policy=superb_provider,
+        )
+        for group in aggregate.groups:
+            write(group_record(job_id, group))
+        totals = BatchTotals(
+            gem_count=request.batch_size,
+            total_surcharge_sp=aggregate.total_surcharge_sp,
+            total_fees_sp=aggregate.total_fees_sp,
+            total_final_value_sp=aggregate.total_final_value_sp,
+            ruined_count=aggregate.ruined_count,
+        )
+
+    write(
+        {
+            "type": "batch",
+            "job": job_id,
+            "category": category,
+            "size": size_label,
+            "gems": totals.gem_count,
+            "retainer": None
+            if not retainer.active
+            else {
+                "race": retainer.race,
+                "months": retainer.months,
+                "fee_paid_gp": retainer.fee_paid_gp,
+                "skill_level": retainer.skill_level,
+                "skill_roll": retainer.skill_roll,
+            },
+            "ruined": totals.ruined_count,
+            "total_final_value_sp": totals.total_final_value_sp,
+            "total_surcharge_sp": totals.total_surcharge_sp,
+            "total_fees_sp": totals.total_fees_sp,
+        }
+    )
+
+
+def run_jobs(
+    lines: Iterable[str],
+    out: TextIO,
+    seed: Optional[int] = None,
+    *,
+    checkpointer: Optional[Checkpointer] = None,
+    resume: Optional[BatchCheckpoint] = None,
+    output_bytes: int = 0,
+) -> int:
+    """Run every job line back to back, streaming JSONL records to ``out``; return the error count.
+
+    With a ``checkpointer``, checkpoints are saved inside detailed batches
+    and between jobs. Their ``extra`` records the job line, the job
+    runner's dice and how many bytes of output belong to that point, so
+    ``resume`` (with ``out`` truncated to ``extra["output_bytes"]`` and
+    opened for appending, and ``output_bytes`` set to match) writes exactly
+    the rest of an uninterrupted run's output.
+    """
+    rng = random.Random(seed)
+    errors = 0
+    written = output_bytes
+    start_line = 1
+    if resume is not None:
+        start_line = resume.extra["line"]
+        errors = resume.extra["errors"]
+        rng.setstate(resume.extra["master_rng"])
+        if not resume.extra["in_job"]:
+            resume = None
+
+    def write(record: dict) -> None:
+        nonlocal written
+        data = json.dumps(record) + "\n"
+        out.write(data)
+        written += len(data)
+
+    def save_boundary(next_line: int) -> None:
+        out.flush()
+        checkpointer.save(
+            BatchCheckpoint(
+                gems_done=0,
+                totals=BatchTotals(),
+                retainer=RetainerState(),
+                rng_state=None,
+                extra={"line": next_line, "in_job": False, "master_rng": rng.getstate(), "output_bytes": written, "errors": errors},
+            )
+        )
+
+    for line_no, line in enumerate(lines, start=1):
+        if line_no < start_line or not line.strip():
+            continue
+        job_rng_state = rng.getstate()
+
+        def job_extra() -> dict:
+            out.flush()
+            return {"line": line_no, "in_job": True, "master_rng": job_rng_state, "output_bytes": written, "errors": errors}
+
+        try:
+            spec = json.loads(line)
+            job_id = spec.get("id", line_no) if isinstance(spec, dict) else line_no
+            run_job(job_id, spec, rng, write, checkpointer=checkpointer, resume=resume, checkpoint_extra=job_extra)
+        except (ValueError, TypeError, AttributeError) as exc:
+            errors += 1
+            write({"type": "error", "line": line_no, "error": str(exc)})
+        resume = None
+        out.flush()
+        if checkpointer is not None and checkpointer.due(0):
+            save_boundary(line_no + 1)
+    return errors
+
+
+# ------------------------
+# STATISTICAL SIMULATION
+# ------------------------
+def simulation_record(result: SimulationResult) -> dict:
+    def metric(summary) -> dict:
+        return {
+            "mean": summary.mean,
+            "std_dev": summary.std_dev,
+            "ci_low": summary.ci_low,
+            "ci_high": summary.ci_high,
+            "quantiles": {str(q): v for q, v in summary.quantiles.items()},
+        }
+
+    return {
+        "replicates": result.replicates,
+        "converged": result.converged,
+        "elapsed_s": result.elapsed_s,
+        "confidence": result.confidence,
+        "total_final_value_sp": metric(result.total_final_value_sp),
+        "total_fees_sp": metric(result.total_fees_sp),
+        "ruin_rate": metric(result.ruin_rate),
+    }
+
+
+def print_simulation(result: SimulationResult, batch_size: int, size_label: str, category: str) -> None:
+    status = "converged" if result.converged else "stopped before reaching the target precision"
+    print(f"Simulated {result.replicates:,} batches of {batch_size} {size_label} gems from {category}")
+    print(f"({status}, {result.elapsed_s:.2f} s)")
+    level = f"{result.confidence:.0%} CI"
+    print(f"{'':<18}{'mean':>14}{'std dev':>14}  {level:<30}{'quantiles'}")
+
+    def money(value: float) -> str:
+        return gp(int(round(value)))
+
+    def percent(value: float) -> str:
+        return f"{value:.2%}"
+
+    rows = (
+        ("Total value", result.total_final_value_sp, money),
+        ("Fees", result.total_fees_sp, money),
+        ("Ruin rate", result.ruin_rate, percent),
+    )
+    for label, summary, fmt in rows:
+        interval = f"{fmt(summary.ci_low)} - {fmt(summary.ci_high)}"
+        quantiles = ", ".join(f"p{q * 100:g} {fmt(v)}" for q, v in summary.quantiles.items())
+        print(f"{label:<18}{fmt(summary.mean):>14}{fmt(summary.std_dev):>14}  {interval:<30}{quantiles}")
+
+
+def run_simulation(args: argparse.Namespace) -> None:
+    category = resolve_category(args.category, random.Random(args.seed))
+    retainer = None
+    if args.race is not None:
+        retainer = RetainerRequest(
+            race=args.race,
+            months=args.months,
+            knows_skill_level=args.skill is not None,
+            known_skill_level=args.skill,
+        )
+    cut_policy = None
+    if retainer is not None and not args.no_cut:
+        cut_policy = CutPolicy(
+            below_value_sp=None if args.cut_below_gp is None else to_sp(args.cut_below_gp),
+            qualities=tuple(args.cut_quality) if args.cut_quality else None,
+        )
+    max_rolls = args.superb_max_rolls
+    if max_rolls is None and args.superb_target_gp is None and not args.superb_optimal:
+        max_rolls = 1
+    superb_policy = SuperbPolicy(
+        stop_at_value_sp=None if args.superb_target_gp is None else to_sp(args.superb_target_gp),
+        max_rolls=max_rolls,
+        optimal=args.superb_optimal,
+    )
+    result = simulate(
+        category,
+        args.size,
+        args.count,
+        retainer=retainer,
+        cut_policy=cut_policy,
+        superb_policy=superb_policy,
+        seed=args.seed,
+        confidence=args.confidence,
+        relative_precision=args.precision,
+        min_replicates=args.min_replicates,
+        max_replicates=args.max_replicates,
+        max_seconds=args.max_seconds,
+    )
+    if args.json:
+        print(json.dumps(simulation_record(result)))
+    else:
+        print_simulation(result, args.count, args.size, category)
+
+
+def _category_arg(text: str):
+    return int(text) if text.isdigit() else text
+
+
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Gem identification workflow")
     parser.add_argument("--gui", action="store_true", help="Launch the Tkinter GUI instead of the CLI")
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for batches that need no per-gem prompts (default: 1)",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Seed the dice for a reproducible session")
+    commands = parser.add_subparsers(dest="command")
+    run_parser = commands.add_parser("run", help="Run batches from a JSONL job file without prompts")
+    run_parser.add_argument("jobs", help="Job file with one JSON batch spec per line ('-' for stdin)")
+    run_parser.add_argument("-o", "--output", default="-", help="Write JSONL results here (default: stdout)")
+    run_parser.add_argument("--checkpoint", metavar="FILE", help="Save progress to FILE so an interrupted run can be resumed")
+    run_parser.add_argument("--checkpoint-every", type=int, metavar="GEMS", help="Save a checkpoint every GEMS gems")
+    run_parser.add_argument(
+        "--checkpoint-seconds",
+        type=float,
+        default=60.0,
+        metavar="S",
+        help="Save a checkpoint every S seconds (default: 60)",
+    )
+    run_parser.add_argument("--resume", action="store_true", help="Continue the run saved in --checkpoint, appending to --output")
+
+    sim_parser = commands.add_parser("simulate", help="Estimate a batch's value by running it repeatedly")
+    sim_parser.add_argument("category", type=_category_arg, help="Category number (1-6) or a unique part of its name")
+    sim_parser.add_argument("--size", choices=list(SIZE_MODIFIERS), default="Average", help="Gem size (default: Average)")
+    sim_parser.add_argument("--count", type=int, default=1, help="Gems per batch (default: 1)")
+    sim_parser.add_argument("--race", choices=list(CUTTER_TYPES), help="Hire a retainer of this race (default: no appraisal)")
+    sim_parser.add_argument("--months", type=int, default=1, help="Months of retainer service (default: 1)")
+    sim_parser.add_argument("--skill", choices=["Shaky", "Fair", "Good", "Superb"], help="Known skill level (default: rolled per batch)")
+    sim_parser.add_argument("--no-cut", action="store_true", help="Appraise only; never cut")
+    sim_parser.add_argument("--cut-below-gp", type=float, help="Only cut gems appraised below this value")
+    sim_parser.add_argument("--cut-quality", action="append", choices=list(POLICY_QUALITIES), help="Only cut gems of this quality (repeatable)")
+    sim_parser.add_argument("--superb-target-gp", type=float, help="Superb cutters stop once the gem reaches this value")
+    sim_parser.add_argument(
+        "--superb-max-rolls",
+        type=int,
+        help="Superb cutters stop after this many rolls (default: 1 unless --superb-target-gp or --superb-optimal is given)",
+    )
+    sim_parser.add_argument("--superb-optimal", action="store_true", help="Superb cutters follow the value-maximizing stop policy")
+    sim_parser.add_argument("--precision", type=float, default=0.01, help="Target relative CI half-width of the mean value (default: 0.01)")
+    sim_parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals (default: 0.95)")
+    sim_parser.add_argument("--min-replicates", type=int, default=30, help="Batches to run before checking precision (default: 30)")
+    sim_parser.add_argument("--max-replicates", type=int, default=100_000, help="Stop after this many batches (default: 100000)")
+    sim_parser.add_argument("--max-seconds", type=float, help="Stop after this much time")
+    sim_parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.command == "run":
+        if args.resume and (args.checkpoint is None or args.output == "-"):
+            parser.error("--resume needs --checkpoint and an --output file")
+        if args.checkpoint_every is not None and args.checkpoint_every < 1:
+            parser.error("--checkpoint-every must be at least 1")
+    return args
 
 
 def main(argv: Optional[List[str]] = None) -> None:
     args = parse_args(argv)
-    if args.gui:
+    if args.command == "run":
+        checkpointer = None
+        resume = None
+        output_bytes = 0
+        if args.checkpoint is not None:
+            checkpointer = Checkpointer(args.checkpoint, every_n=args.checkpoint_every, every_s=args.checkpoint_seconds)
+        if args.resume:
+            try:
+                resume = load_checkpoint(args.checkpoint)
+            except (OSError, ValueError) as exc:
+                sys.exit(f"error: cannot resume: {exc}")
+            output_bytes = resume.extra["output_bytes"]
+            # Drop whatever was written after the checkpoint so the rest is not duplicated.
+            with open(args.output, "r+b") as partial:
+                partial.truncate(output_bytes)
+        jobs = sys.stdin if args.jobs == "-" else open(args.jobs, encoding="utf-8")
+        if args.output == "-":
+            out = sys.stdout
+        else:
+            # Checkpoints count output bytes, so keep newlines untranslated on every platform.
+            newline = "\n" if checkpointer is not None else None
+            out = open(args.output, "a" if args.resume else "w", encoding="utf-8", newline=newline)
+        try:
+            errors = run_jobs(
+                jobs,
+                out,
+                seed=args.seed,
+                checkpointer=checkpointer,
+                resume=resume,
+                output_bytes=output_bytes,
+            )
+        finally:
+            if jobs is not sys.stdin:
+                jobs.close()
+            if out is not sys.stdout:
+                out.close()
+        if errors:
+            sys.exit(1)
+    elif args.command == "simulate":
+        try:
+            run_simulation(args)
+        except ValueError as exc:
+            sys.exit(f"error: {exc}")
+    elif args.gui:
         from gui import run as run_gui
 
         run_gui()
     else:
-        run_cli()
+        run_cli(workers=args.workers, seed=args.seed)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,26 @@
 """Tkinter-based GUI for the gem identification and cutting workflow."""
 from __future__ import annotations
 
+import queue
 import random
+import shutil
+import tempfile
+import threading
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence
 
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, ttk
 
 from core import (
     CUTTER_TYPES,
-    GEMS,
+    GEM_CATALOG,
     SIZE_MODIFIERS,
+    BatchObserver,
     BatchRequest,
     BatchResult,
+    BatchTotals,
+    CutPolicy,
     GemAppraisalContext,
     GemPlan,
     GemResult,
@@ -23,12 +30,22 @@ from core import (
     SuperbRollStep,
     gp,
     hire_retainer,
-    process_batch,
+    iter_batch,
+    retainer_usage_for,
     roll_for_category,
     roll_for_gem,
 )
 
 
+MAX_BATCH_SIZE = 1_000_000
+EVENT_POLL_MS = 30
+MAX_EVENTS_PER_POLL = 2_000
+LOG_MAX_LINES = 10_000
+LOG_FLUSH_MS = 16
+DEFAULT_ROW_HEIGHT = 20
+HEADING_HEIGHT = 24
+
+
 @dataclass
 class GemRow:
     """Represents the desired gem plan for a single row in the GUI."""
@@ -38,6 +55,212 @@ class GemRow:
     base_gp: float
 
 
+class VirtualTreeview:
+    """A ttk.Treeview that only materializes the rows currently on screen.
+
+    Rows are identified by their position in the caller's data; ``row_values``
+    is asked for the cells of visible rows only, so browsing a list of any
+    length costs the same as a one-screen list.
+    """
+
+    def __init__(
+        self,
+        parent: tk.Misc,
+        columns: Sequence[str],
+        *,
+        row_values: Callable[[int], Sequence[str]],
+        on_select: Callable[[int], None],
+        height: int = 12,
+    ) -> None:
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=tuple(columns), show="headings", selectmode="browse", height=height)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.row_values = row_values
+        self.on_select = on_select
+        self.row_count = 0
+        self.offset = 0
+        self.visible = height
+        self.selected_index: Optional[int] = None
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda _evt: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda _evt: self.scroll_by(3))
+        self.tree.bind("<Up>", lambda _evt: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda _evt: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda _evt: self._move_selection(-self.visible))
+        self.tree.bind("<Next>", lambda _evt: self._move_selection(self.visible))
+
+    def set_row_count(self, count: int) -> None:
+        """Change the number of data rows; only the visible window is redrawn."""
+        self.row_count = count
+        if self.selected_index is not None and self.selected_index >= count:
+            self.selected_index = None
+        self._render()
+
+    def refresh_row(self, index: int) -> None:
+        slot = index - self.offset
+        if 0 <= slot < len(self.tree.get_children()):
+            self.tree.item(f"r{slot}", values=tuple(self.row_values(index)))
+
+    def refresh(self) -> None:
+        self._render()
+
+    def select(self, index: int) -> None:
+        if not 0 <= index < self.row_count:
+            return
+        self.selected_index = index
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible:
+            self.offset = index - self.visible + 1
+        self._render()
+        self.on_select(index)
+
+    def scroll_by(self, rows: int) -> str:
+        self._scroll_to(self.offset + rows)
+        return "break"
+
+    def _scroll_to(self, offset: int) -> None:
+        offset = max(0, min(offset, self.row_count - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _render(self) -> None:
+        self.offset = max(0, min(self.offset, self.row_count - self.visible))
+        needed = max(0, min(self.visible, self.row_count - self.offset))
+        items = self.tree.get_children()
+        for slot in range(needed, len(items)):
+            self.tree.delete(f"r{slot}")
+        for slot in range(needed):
+            values = tuple(self.row_values(self.offset + slot))
+            if slot < len(items):
+                self.tree.item(f"r{slot}", values=values)
+            else:
+                self.tree.insert("", tk.END, iid=f"r{slot}", values=values)
+
+        slot = None if self.selected_index is None else self.selected_index - self.offset
+        if slot is not None and 0 <= slot < needed:
+            self.tree.selection_set(f"r{slot}")
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if self.row_count:
+            self.scrollbar.set(self.offset / self.row_count, min(1.0, (self.offset + needed) / self.row_count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_tree_select(self, _event: tk.Event) -> None:  # type: ignore[override]
+        selection = self.tree.selection()
+        if not selection:
+            return
+        index = self.offset + int(selection[0][1:])
+        if index != self.selected_index:
+            self.selected_index = index
+            self.on_select(index)
+
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * self.row_count))
+        elif action == "scroll":
+            step = self.visible if unit == "pages" else 1
+            self._scroll_to(self.offset + int(amount) * step)
+
+    def _on_mousewheel(self, event: tk.Event) -> str:  # type: ignore[override]
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def _move_selection(self, delta: int) -> str:
+        if self.row_count:
+            current = self.selected_index if self.selected_index is not None else self.offset
+            self.select(max(0, min(self.row_count - 1, current + delta)))
+        return "break"
+
+    def _on_configure(self, event: tk.Event) -> None:  # type: ignore[override]
+        row_height = ttk.Style(self.tree).lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT
+        visible = max(1, (event.height - HEADING_HEIGHT) // int(row_height))
+        if visible != self.visible:
+            self.visible = visible
+            self._render()
+
+
+class LogBuffer:
+    """Append-only log view for a Text widget.
+
+    Appends are coalesced into one widget update per frame, the widget keeps
+    only the last ``max_lines`` lines, and every line is also spooled to a
+    temporary file so the full log can be saved on demand.
+    """
+
+    def __init__(self, root: tk.Misc, widget: tk.Text, max_lines: int = LOG_MAX_LINES) -> None:
+        self.root = root
+        self.widget = widget
+        self.max_lines = max_lines
+        self._pending: List[str] = []
+        self._flush_scheduled = False
+        self._line_count = 0
+        self._spool = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+
+    def append(self, message: str) -> None:
+        if not message.endswith("\n"):
+            message += "\n"
+        self._pending.append(message)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after(LOG_FLUSH_MS, self.flush)
+
+    def flush(self) -> None:
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending = []
+        self._spool.write(text)
+
+        new_lines = text.count("\n")
+        if new_lines > self.max_lines:
+            # Only the tail of a very large burst can stay visible anyway.
+            text = "".join(text.splitlines(keepends=True)[-self.max_lines:])
+            new_lines = self.max_lines
+        self.widget.configure(state="normal")
+        self.widget.insert(tk.END, text)
+        self._line_count += new_lines
+        excess = self._line_count - self.max_lines
+        if excess > 0:
+            self.widget.delete("1.0", f"{excess + 1}.0")
+            self._line_count -= excess
+        self.widget.configure(state="disabled")
+        self.widget.see(tk.END)
+
+    def clear(self) -> None:
+        self._pending = []
+        self._line_count = 0
+        self._spool.seek(0)
+        self._spool.truncate()
+        self.widget.configure(state="normal")
+        self.widget.delete("1.0", tk.END)
+        self.widget.configure(state="disabled")
+
+    def save(self, path: str) -> None:
+        self.flush()
+        self._spool.flush()
+        self._spool.seek(0)
+        with open(path, "w", encoding="utf-8") as out:
+            shutil.copyfileobj(self._spool, out)
+        self._spool.seek(0, 2)
+
+    def close(self) -> None:
+        """Discard the spooled log; the buffer must not be used afterwards."""
+        self._pending = []
+        self._spool.close()
+
+
 class GemApp:
     """Main GUI application for gem identification."""
 
@@ -49,7 +272,7 @@ class GemApp:
         self.rng = random.Random()
         self.retainer_state = RetainerState()
 
-        self.category_var = tk.StringVar(value=list(GEMS.keys())[0])
+        self.category_var = tk.StringVar(value=GEM_CATALOG.categories[0])
         self.batch_size_var = tk.IntVar(value=1)
         self.mixed_var = tk.BooleanVar(value=False)
         self.size_var = tk.StringVar(value=list(SIZE_MODIFIERS.keys())[2])
@@ -59,10 +282,18 @@ class GemApp:
         self.selected_row_index: Optional[int] = None
         self.gem_rows: List[GemRow] = []
         self.latest_result: Optional[BatchResult] = None
+        self.result_rows: List[GemResult] = []
+        self.results_appraised = False
+
+        # Batch processing runs on a worker thread that reports back through this queue.
+        self.events: "queue.Queue[tuple]" = queue.Queue()
+        self.worker: Optional[threading.Thread] = None
+        self.cancel_event = threading.Event()
 
         self._build_ui()
         self._initialize_rows()
         self._update_retainer_summary()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
     # ------------------------------------------------------------------
     # UI construction
@@ -130,11 +361,11 @@ class GemApp:
         header.grid(row=0, column=0, columnspan=4, sticky="w", pady=(0, 10))
 
         ttk.Label(frame, text="Batch size:").grid(row=1, column=0, sticky="e", padx=5, pady=5)
-        self.batch_size_spin = ttk.Spinbox(frame, from_=1, to=999, textvariable=self.batch_size_var, width=6, command=self._on_batch_size_change)
+        self.batch_size_spin = ttk.Spinbox(frame, from_=1, to=MAX_BATCH_SIZE, textvariable=self.batch_size_var, width=6, command=self._on_batch_size_change)
         self.batch_size_spin.grid(row=1, column=1, sticky="w", pady=5)
 
         ttk.Label(frame, text="Gem category:").grid(row=1, column=2, sticky="e", padx=5, pady=5)
-        self.category_box = ttk.Combobox(frame, values=list(GEMS.keys()), textvariable=self.category_var, state="readonly")
+        self.category_box = ttk.Combobox(frame, values=list(GEM_CATALOG.categories), textvariable=self.category_var, state="readonly")
         self.category_box.grid(row=1, column=3, sticky="w", pady=5)
         self.category_box.bind("<<ComboboxSelected>>", lambda _evt: self._on_category_change())
 
@@ -165,15 +396,20 @@ class GemApp:
         ttk.Button(gem_controls, text="Fill Entire Batch", command=self._fill_entire_batch).grid(row=0, column=3, padx=5)
         ttk.Button(gem_controls, text="Roll Batch", command=self._roll_entire_batch).grid(row=0, column=4, padx=5)
 
-        self.plans_tree = ttk.Treeview(frame, columns=("gem", "color", "base"), show="headings", selectmode="browse", height=12)
+        self.plans_view = VirtualTreeview(
+            frame,
+            ("gem", "color", "base"),
+            row_values=self._plan_row_values,
+            on_select=self._on_plan_select,
+        )
+        self.plans_tree = self.plans_view.tree
         self.plans_tree.heading("gem", text="Gem")
         self.plans_tree.heading("color", text="Color")
         self.plans_tree.heading("base", text="Base GP")
         self.plans_tree.column("gem", width=180)
         self.plans_tree.column("color", width=200)
         self.plans_tree.column("base", width=100, anchor="e")
-        self.plans_tree.grid(row=5, column=0, columnspan=5, sticky="nsew", pady=(10, 0))
-        self.plans_tree.bind("<<TreeviewSelect>>", self._on_plan_select)
+        self.plans_view.frame.grid(row=5, column=0, columnspan=5, sticky="nsew", pady=(10, 0))
 
         frame.grid_rowconfigure(5, weight=1)
         frame.grid_columnconfigure(4, weight=1)
@@ -187,7 +423,16 @@ class GemApp:
         ttk.Checkbutton(options_frame, text="Appraise and cut this batch (requires active retainer)", variable=self.appraise_var, command=self._sync_appraise_controls).grid(row=0, column=0, sticky="w", padx=8, pady=5)
         ttk.Checkbutton(options_frame, text="Automatically cut all gems", variable=self.auto_cut_var).grid(row=0, column=1, sticky="w", padx=8, pady=5)
 
-        ttk.Button(options_frame, text="Process Batch", command=self._process_batch).grid(row=0, column=2, padx=8, pady=5)
+        self.process_button = ttk.Button(options_frame, text="Process Batch", command=self._process_batch)
+        self.process_button.grid(row=0, column=2, padx=8, pady=5)
+        self.cancel_button = ttk.Button(options_frame, text="Cancel", command=self._cancel_batch, state="disabled")
+        self.cancel_button.grid(row=0, column=3, padx=8, pady=5)
+
+        self.progress = ttk.Progressbar(options_frame, mode="determinate")
+        self.progress.grid(row=1, column=0, columnspan=3, sticky="ew", padx=8, pady=(0, 5))
+        self.progress_label = ttk.Label(options_frame, text="")
+        self.progress_label.grid(row=1, column=3, sticky="w", padx=8, pady=(0, 5))
+        options_frame.grid_columnconfigure(1, weight=1)
 
         splitter = ttk.Panedwindow(frame, orient=tk.VERTICAL)
         splitter.pack(fill=tk.BOTH, expand=True)
@@ -197,7 +442,13 @@ class GemApp:
         splitter.add(top_panel, weight=3)
         splitter.add(bottom_panel, weight=2)
 
-        self.results_tree = ttk.Treeview(top_panel, columns=("gem", "quality", "final", "fees"), show="headings", height=12)
+        self.results_view = VirtualTreeview(
+            top_panel,
+            ("gem", "quality", "final", "fees"),
+            row_values=self._result_row_values,
+            on_select=self._on_result_select,
+        )
+        self.results_tree = self.results_view.tree
         self.results_tree.heading("gem", text="Gem")
         self.results_tree.heading("quality", text="Quality")
         self.results_tree.heading("final", text="Final Value")
@@ -206,8 +457,7 @@ class GemApp:
         self.results_tree.column("quality", width=220)
         self.results_tree.column("final", width=140, anchor="e")
         self.results_tree.column("fees", width=120, anchor="e")
-        self.results_tree.pack(fill=tk.BOTH, expand=True)
-        self.results_tree.bind("<<TreeviewSelect>>", self._on_result_select)
+        self.results_view.frame.pack(fill=tk.BOTH, expand=True)
 
         info_frame = ttk.Frame(bottom_panel)
         info_frame.pack(fill=tk.BOTH, expand=True)
@@ -221,11 +471,15 @@ class GemApp:
         self.detail_text = tk.Text(info_frame, height=12, state="disabled", wrap="word")
         self.detail_text.pack(fill=tk.BOTH, expand=True)
 
-        log_label = ttk.Label(info_frame, text="Processing log:", font=("TkDefaultFont", 11, "bold"))
-        log_label.pack(anchor="w", pady=(10, 0))
+        log_header = ttk.Frame(info_frame)
+        log_header.pack(fill=tk.X, pady=(10, 0))
+        log_label = ttk.Label(log_header, text="Processing log:", font=("TkDefaultFont", 11, "bold"))
+        log_label.pack(side=tk.LEFT)
+        ttk.Button(log_header, text="Save Log...", command=self._save_log).pack(side=tk.RIGHT)
 
         self.log_text = tk.Text(info_frame, height=8, state="disabled", wrap="word")
         self.log_text.pack(fill=tk.BOTH, expand=True)
+        self.log = LogBuffer(self.root, self.log_text)
 
     # ------------------------------------------------------------------
     # Retainer interactions
@@ -300,8 +554,7 @@ class GemApp:
         self._refresh_plan_rows()
 
     def _populate_gem_choices(self) -> None:
-        gems_list = list(GEMS[self.category_var.get()])
-        names = [name for name, _color, _gp in gems_list]
+        names = [entry.name for entry in GEM_CATALOG.in_category(self.category_var.get())]
         self.gem_choice_box.configure(values=names)
         if names:
             self.gem_choice_box.current(0)
@@ -312,38 +565,39 @@ class GemApp:
             desired_size = 1
             self.batch_size_var.set(1)
 
-        gems_list = list(GEMS[self.category_var.get()])
-        default_name, default_color, default_gp = gems_list[0]
+        default = GEM_CATALOG.by_index(self.category_var.get(), 0)
 
-        while len(self.gem_rows) < desired_size:
-            self.gem_rows.append(GemRow(default_name, default_color, default_gp))
+        missing = desired_size - len(self.gem_rows)
+        if missing > 0:
+            self.gem_rows.extend(GemRow(default.name, default.color, default.base_gp) for _ in range(missing))
 
         if len(self.gem_rows) > desired_size:
-            self.gem_rows = self.gem_rows[:desired_size]
+            del self.gem_rows[desired_size:]
 
-        # rebuild tree
-        for item in self.plans_tree.get_children():
-            self.plans_tree.delete(item)
+        # only the visible window of the plan list is redrawn
+        self.plans_view.set_row_count(len(self.gem_rows))
+        if self.selected_row_index is not None and self.selected_row_index >= len(self.gem_rows):
+            self.selected_row_index = None
 
-        for idx, row in enumerate(self.gem_rows, start=1):
-            self.plans_tree.insert("", tk.END, iid=str(idx - 1), values=(row.name, row.color, f"{row.base_gp:,.0f}"))
+    def _plan_row_values(self, index: int) -> Sequence[str]:
+        row = self.gem_rows[index]
+        return (row.name, row.color, f"{row.base_gp:,.0f}")
 
     def _on_batch_size_change(self) -> None:
         try:
             val = int(self.batch_size_spin.get())
-            self.batch_size_var.set(max(1, min(999, val)))
+            self.batch_size_var.set(max(1, min(MAX_BATCH_SIZE, val)))
         except ValueError:
             self.batch_size_var.set(1)
         self._refresh_plan_rows()
 
     def _on_category_change(self) -> None:
         self._populate_gem_choices()
-        gems_list = list(GEMS[self.category_var.get()])
-        default_name, default_color, default_gp = gems_list[0]
+        default = GEM_CATALOG.by_index(self.category_var.get(), 0)
         for row in self.gem_rows:
-            row.name = default_name
-            row.color = default_color
-            row.base_gp = default_gp
+            row.name = default.name
+            row.color = default.color
+            row.base_gp = default.base_gp
         self._refresh_plan_rows()
 
     def _on_mixed_toggle(self) -> None:
@@ -358,7 +612,7 @@ class GemApp:
             self._refresh_plan_rows()
 
     def _roll_category(self) -> None:
-        categories = list(GEMS.keys())
+        categories = list(GEM_CATALOG.categories)
         category, roll = roll_for_category(categories, rng=self.rng)
         shown = "00" if roll == 100 else f"{roll:02d}"
         messagebox.showinfo("Category roll", f"Rolled {shown} → {category}")
@@ -366,11 +620,11 @@ class GemApp:
         self._on_category_change()
 
     def _roll_gem_for_selection(self) -> None:
-        gems_list = list(GEMS[self.category_var.get()])
+        gems_list = GEM_CATALOG.in_category(self.category_var.get())
         idx, roll = roll_for_gem(gems_list, rng=self.rng)
-        name, color, _ = gems_list[idx]
-        messagebox.showinfo("Gem roll", f"Rolled d{len(gems_list)} = {roll} → {name} ({color})")
-        self.gem_choice_box.set(name)
+        entry = gems_list[idx]
+        messagebox.showinfo("Gem roll", f"Rolled d{len(gems_list)} = {roll} → {entry.name} ({entry.color})")
+        self.gem_choice_box.set(entry.name)
 
     def _apply_gem_to_selected_row(self) -> None:
         if self.selected_row_index is None:
@@ -383,49 +637,42 @@ class GemApp:
         if not name:
             messagebox.showwarning("No gem chosen", "Select a gem from the dropdown first.")
             return
-        gems_list = list(GEMS[self.category_var.get()])
-        for gem_name, color, base in gems_list:
-            if gem_name == name:
-                self.gem_rows[index] = GemRow(gem_name, color, base)
-                break
-        self._refresh_plan_rows()
+        entry = GEM_CATALOG.by_name(name)
+        if entry is not None and entry.category == self.category_var.get():
+            self.gem_rows[index] = GemRow(entry.name, entry.color, entry.base_gp)
 
-        if not self.mixed_var.get():
+        if self.mixed_var.get():
+            self.plans_view.refresh_row(index)
+        else:
             first = self.gem_rows[index]
             for row in self.gem_rows:
                 row.name = first.name
                 row.color = first.color
                 row.base_gp = first.base_gp
-            self._refresh_plan_rows()
+            self.plans_view.refresh()
 
     def _fill_entire_batch(self) -> None:
         name = self.gem_choice_box.get()
         if not name:
             messagebox.showwarning("No gem chosen", "Select a gem to fill the batch.")
             return
-        gems_list = list(GEMS[self.category_var.get()])
-        for gem_name, color, base in gems_list:
-            if gem_name == name:
-                self.gem_rows = [GemRow(gem_name, color, base) for _ in self.gem_rows]
-                break
+        entry = GEM_CATALOG.by_name(name)
+        if entry is not None and entry.category == self.category_var.get():
+            self.gem_rows = [GemRow(entry.name, entry.color, entry.base_gp) for _ in self.gem_rows]
         self._refresh_plan_rows()
 
     def _roll_entire_batch(self) -> None:
-        gems_list = list(GEMS[self.category_var.get()])
+        gems_list = GEM_CATALOG.in_category(self.category_var.get())
         new_rows: List[GemRow] = []
         for _ in self.gem_rows:
             idx, roll = roll_for_gem(gems_list, rng=self.rng)
-            name, color, base = gems_list[idx]
-            new_rows.append(GemRow(name, color, base))
+            entry = gems_list[idx]
+            new_rows.append(GemRow(entry.name, entry.color, entry.base_gp))
         self.gem_rows = new_rows
         self._refresh_plan_rows()
 
-    def _on_plan_select(self, event: tk.Event) -> None:  # type: ignore[override]
-        selection = self.plans_tree.selection()
-        if not selection:
-            self.selected_row_index = None
-            return
-        self.selected_row_index = int(selection[0])
+    def _on_plan_select(self, index: int) -> None:
+        self.selected_row_index = index
 
     # ------------------------------------------------------------------
     # Processing helpers
@@ -436,6 +683,8 @@ class GemApp:
             self.auto_cut_var.set(False)
 
     def _process_batch(self) -> None:
+        if self.worker is not None:
+            return
         if self.appraise_var.get() and not self.retainer_state.active:
             messagebox.showerror("No retainer", "Hire a retainer before appraising and cutting gems.")
             return
@@ -456,27 +705,173 @@ class GemApp:
             appraise=self.appraise_var.get(),
         )
 
-        self._set_text_widget(self.log_text, "")
-
-        result = process_batch(
-            self.retainer_state,
-            batch_request,
-            rng=self.rng,
-            on_gem_start=self._handle_gem_start,
-            on_appraisal=self._handle_appraisal,
-            cut_decision_provider=self._make_cut_decision_provider(),
-            superb_decision_provider=self._make_superb_decision_provider(),
+        self.log.clear()
+        self._clear_results(batch_request.appraise)
+        self.progress.configure(maximum=batch_request.batch_size, value=0)
+        self.progress_label.configure(text=f"0 / {batch_request.batch_size}")
+        self.process_button.state(["disabled"])
+        self.cancel_button.state(["!disabled"])
+
+        # Tk variables are read here, on the main thread; the worker only sees plain values.
+        # Batches that never ask anything are logged per chunk instead of per gem.
+        auto_cut = batch_request.appraise and self.auto_cut_var.get()
+        interactive = batch_request.appraise and (not auto_cut or self.retainer_state.skill_level == "Superb")
+        if interactive:
+            cut_provider = self._make_cut_decision_provider()
+            superb_provider = self._make_superb_decision_provider()
+        else:
+            cut_provider = CutPolicy() if auto_cut else None
+            superb_provider = None
+        self.cancel_event = threading.Event()
+        self.worker = threading.Thread(
+            target=self._run_batch_worker,
+            args=(
+                self.retainer_state,
+                batch_request,
+                random.Random(self.rng.getrandbits(64)),
+                cut_provider,
+                superb_provider,
+                interactive,
+                self.cancel_event,
+            ),
+            daemon=True,
         )
-
-        self._populate_results(result)
+        self.worker.start()
+        self.root.after(EVENT_POLL_MS, self._drain_events)
+
+    def _cancel_batch(self) -> None:
+        if self.worker is not None:
+            self.cancel_event.set()
+            self.cancel_button.state(["disabled"])
+            self.progress_label.configure(text="Cancelling...")
+
+    def _run_batch_worker(
+        self,
+        retainer: RetainerState,
+        request: BatchRequest,
+        rng: random.Random,
+        cut_provider: Optional[Callable[[GemAppraisalContext], bool]],
+        superb_provider: Optional[Callable[[SuperbRollStep], bool]],
+        interactive: bool,
+        cancel_event: threading.Event,
+    ) -> None:
+        """Process the batch off the Tk thread; every UI update goes through ``self.events``.
+
+        Interactive batches log each gem through the per-gem hooks and hand
+        over every result at once, so the rows are current when a dialog
+        asks about the next gem. Other batches run without hooks and hand
+        over results and one log line per poll interval.
+        """
+
+        def deliver(chunk: List[GemResult], totals: BatchTotals) -> None:
+            self.events.put(("results", chunk))
+            if not interactive:
+                self.events.put(("log", self._progress_text(chunk, totals, request.batch_size)))
+
+        observer = BatchObserver(
+            deliver,
+            every_n=1 if interactive else None,
+            every_ms=None if interactive else EVENT_POLL_MS,
+        )
+        try:
+            totals = BatchTotals()
+            gem_results: List[GemResult] = []
+            for gem_result in iter_batch(
+                retainer,
+                request,
+                totals=totals,
+                rng=rng,
+                on_gem_start=self._handle_gem_start if interactive else None,
+                on_appraisal=self._handle_appraisal if interactive else None,
+                cut_decision_provider=cut_provider,
+                superb_decision_provider=superb_provider,
+                observer=observer,
+            ):
+                gem_results.append(gem_result)
+                if cancel_event.is_set():
+                    break
+
+            cancelled = len(gem_results) < request.batch_size
+            if cancelled:
+                request = request.replace(batch_size=len(gem_results), gem_plans=list(request.gem_plans)[: len(gem_results)])
+            result = BatchResult(
+                request=request,
+                retainer_usage=retainer_usage_for(retainer, request),
+                gem_results=gem_results,
+                total_surcharge_sp=totals.total_surcharge_sp,
+                total_fees_sp=totals.total_fees_sp,
+                total_final_value_sp=totals.total_final_value_sp,
+                ruined_count=totals.ruined_count,
+            )
+            self.events.put(("done", result, cancelled))
+        except Exception as exc:  # reported on the main thread
+            self.events.put(("error", exc))
+
+    def _ask_on_main_thread(self, ask: Callable[[], bool]) -> bool:
+        """Block the worker until the main thread has shown a dialog and answered it."""
+        if self.cancel_event.is_set():
+            return False
+        reply: "queue.Queue[bool]" = queue.Queue(maxsize=1)
+        self.events.put(("ask", ask, reply))
+        return reply.get()
+
+    def _drain_events(self) -> None:
+        new_results: List[GemResult] = []
+        for _ in range(MAX_EVENTS_PER_POLL):
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            kind = event[0]
+            if kind == "log":
+                self._append_log(event[1])
+            elif kind == "results":
+                new_results.extend(event[1])
+            elif kind == "ask":
+                self._append_result_rows(new_results)
+                new_results = []
+                _kind, ask, reply = event
+                reply.put(False if self.cancel_event.is_set() else bool(ask()))
+            elif kind == "done":
+                self._append_result_rows(new_results)
+                self._finish_batch(event[1], event[2])
+                return
+            elif kind == "error":
+                self._append_result_rows(new_results)
+                self._finish_batch(None, True)
+                messagebox.showerror("Processing error", str(event[1]))
+                return
+        self._append_result_rows(new_results)
+        self.root.after(EVENT_POLL_MS, self._drain_events)
+
+    def _finish_batch(self, result: Optional[BatchResult], cancelled: bool) -> None:
+        self.worker = None
+        self.process_button.state(["!disabled"])
+        self.cancel_button.state(["disabled"])
+        done = len(self.result_rows)
+        self.progress_label.configure(text=f"{done} / {int(self.progress['maximum'])}" + (" (cancelled)" if cancelled else ""))
+        if result is None:
+            return
+        self.latest_result = result
         self._render_summary(result)
+        if self.result_rows and self.results_view.selected_index is None:
+            self.results_view.select(0)
+
+    @staticmethod
+    def _progress_text(chunk: Sequence[GemResult], totals: BatchTotals, total: int) -> str:
+        first, last = chunk[0].index, chunk[-1].index
+        gems = f"Gem {first}" if first == last else f"Gems {first}–{last}"
+        return (
+            f"{gems} of {total} done — running value {gp(totals.total_final_value_sp)}, "
+            f"{totals.ruined_count} ruined\n"
+        )
 
     def _handle_gem_start(self, ctx: GemStartContext) -> None:
         text = (
             f"Gem {ctx.index} of {ctx.total}: {ctx.plan.name} ({ctx.plan.color}) — "
             f"Size-adjusted base {gp(ctx.base_value_sp)}\n"
         )
-        self._append_log(text)
+        self.events.put(("log", text))
 
     def _handle_appraisal(self, ctx: GemAppraisalContext) -> None:
         if not ctx.appraisal.rolls:
@@ -485,7 +880,7 @@ class GemApp:
             f"Appraisal → {ctx.appraisal.quality_label}; value {gp(ctx.appraisal.adjusted_value_sp)}; "
             f"rolls {ctx.appraisal.rolls}\n"
         )
-        self._append_log(text)
+        self.events.put(("log", text))
 
     def _make_cut_decision_provider(self) -> Optional[Callable[[GemAppraisalContext], bool]]:
         if not self.appraise_var.get():
@@ -502,7 +897,7 @@ class GemApp:
                 f"Quality: {ctx.appraisal.quality_label}\n"
                 f"Current value: {gp(ctx.appraisal.adjusted_value_sp)}"
             )
-            return messagebox.askyesno("Cut gem", prompt, parent=self.root)
+            return self._ask_on_main_thread(lambda: messagebox.askyesno("Cut gem", prompt, parent=self.root))
 
         return provider
 
@@ -516,37 +911,43 @@ class GemApp:
                 f"Current value: {gp(step.current_value_sp)}"
             )
             if step.cap_reached or step.result_text == "Gem ruined!":
-                messagebox.showinfo("Superb cut", base_message, parent=self.root)
-                return False
-            return messagebox.askyesno("Superb cut", base_message + "\nRoll again?", parent=self.root)
+
+                def notify() -> bool:
+                    messagebox.showinfo("Superb cut", base_message, parent=self.root)
+                    return False
+
+                return self._ask_on_main_thread(notify)
+            return self._ask_on_main_thread(
+                lambda: messagebox.askyesno("Superb cut", base_message + "\nRoll again?", parent=self.root)
+            )
 
         return provider
 
     # ------------------------------------------------------------------
     # Results rendering
     # ------------------------------------------------------------------
-    def _populate_results(self, result: BatchResult) -> None:
-        for item in self.results_tree.get_children():
-            self.results_tree.delete(item)
-
-        for rec in result.gem_results:
-            quality = rec.appraisal.quality_label if result.request.appraise else "n/a"
-            final_value = gp(rec.final_value_sp)
-            fees = gp(rec.fees_this_gem_sp) if result.request.appraise else "0 gp"
-            self.results_tree.insert(
-                "",
-                tk.END,
-                iid=str(rec.index - 1),
-                values=(rec.plan.name, quality, final_value, fees),
-            )
-
-        if result.gem_results:
-            self.results_tree.selection_set("0")
-            self._show_gem_details(result.gem_results[0])
-        else:
-            self._set_text_widget(self.detail_text, "")
+    def _clear_results(self, appraised: bool) -> None:
+        self.result_rows = []
+        self.results_appraised = appraised
+        self.latest_result = None
+        self.results_view.selected_index = None
+        self.results_view.set_row_count(0)
+        self._set_text_widget(self.detail_text, "")
+        self._set_text_widget(self.summary_text, "")
+
+    def _append_result_rows(self, results: Sequence[GemResult]) -> None:
+        if not results:
+            return
+        self.result_rows.extend(results)
+        self.results_view.set_row_count(len(self.result_rows))
+        self.progress.configure(value=len(self.result_rows))
+        self.progress_label.configure(text=f"{len(self.result_rows)} / {int(self.progress['maximum'])}")
 
-        self.latest_result = result
+    def _result_row_values(self, index: int) -> Sequence[str]:
+        rec = self.result_rows[index]
+        quality = rec.appraisal.quality_label if self.results_appraised else "n/a"
+        fees = gp(rec.fees_this_gem_sp) if self.results_appraised else "0 gp"
+        return (rec.plan.name, quality, gp(rec.final_value_sp), fees)
 
     def _render_summary(self, result: BatchResult) -> None:
         lines = [
@@ -575,16 +976,9 @@ class GemApp:
             lines.append(f"Ruined gems: {result.ruined_count}")
         self._set_text_widget(self.summary_text, "\n".join(lines))
 
-    def _on_result_select(self, _event: tk.Event) -> None:  # type: ignore[override]
-        selection = self.results_tree.selection()
-        if not selection:
-            return
-        idx = int(selection[0])
-        if not self.latest_result:
-            return
-        result: BatchResult = self.latest_result
-        if 0 <= idx < len(result.gem_results):
-            self._show_gem_details(result.gem_results[idx])
+    def _on_result_select(self, index: int) -> None:
+        if 0 <= index < len(self.result_rows):
+            self._show_gem_details(self.result_rows[index])
 
     def _show_gem_details(self, gem_result: GemResult) -> None:
         lines = [
@@ -616,9 +1010,21 @@ class GemApp:
     # Logging utilities
     # ------------------------------------------------------------------
     def _append_log(self, message: str) -> None:
-        current = self.log_text.get("1.0", tk.END)
-        new_text = current.rstrip() + ("\n" if current.strip() else "") + message
-        self._set_text_widget(self.log_text, new_text)
+        self.log.append(message)
+
+    def _save_log(self) -> None:
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Save processing log",
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            self.log.save(path)
+        except OSError as exc:
+            messagebox.showerror("Save failed", str(exc))
 
     def _set_text_widget(self, widget: tk.Text, value: str) -> None:
         widget.configure(state="normal")
@@ -632,6 +1038,11 @@ class GemApp:
     def run(self) -> None:
         self.root.mainloop()
 
+    def _on_close(self) -> None:
+        self.cancel_event.set()
+        self.log.close()
+        self.root.destroy()
+
 
 def run() -> None:
     """Launch the GUI application."""
@@ -0,0 +1,129 @@
+"""Aggregate batches against the exact distribution and the per-gem loop."""
+import math
+import random
+import unittest
+
+from core import (
+    DEFAULT_LADDER,
+    GEM_CATALOG,
+    SIZE_MODIFIERS,
+    BatchRequest,
+    CutPolicy,
+    RetainerRequest,
+    RetainerState,
+    SuperbPolicy,
+    hire_retainer,
+    process_batch,
+    process_batch_aggregate,
+    value_distribution,
+)
+
+GEMS = 100_000
+FALLBACK_GEMS = 5_000
+SEED = 22
+
+
+def _retainer(skill):
+    request = RetainerRequest(race="Dwarf", months=1, knows_skill_level=True, known_skill_level=skill)
+    return hire_retainer(RetainerState(), request, rng=random.Random(0)).state
+
+
+def _identical_request(count, appraise=True, size_label="Average"):
+    entry = GEM_CATALOG.by_name("Amethyst")
+    return BatchRequest(
+        batch_size=count,
+        category=entry.category,
+        size_label=size_label,
+        size_modifier=SIZE_MODIFIERS[size_label],
+        gem_plans=[entry.plan()] * count,
+        appraise=appraise,
+    )
+
+
+class AggregateTest(unittest.TestCase):
+    def assert_matches_exact(self, result, exact, count):
+        standard_error = exact.std_dev_sp / math.sqrt(count)
+        self.assertLess(abs(result.total_final_value_sp / count - exact.expected_value_sp), 4 * standard_error)
+        p = exact.ruin_probability
+        self.assertLess(abs(result.ruined_count / count - p), 4 * math.sqrt(p * (1 - p) / count) + 1e-9)
+
+    def test_identical_plans_match_exact_distribution(self):
+        request = _identical_request(GEMS)
+        base = GEM_CATALOG.by_name("Amethyst").base_sp_by_size["Average"]
+        band = DEFAULT_LADDER.band(base)
+        for skill in ("Shaky", "Fair", "Good", "Superb"):
+            with self.subTest(skill=skill):
+                retainer = _retainer(skill)
+                result = process_batch_aggregate(
+                    retainer,
+                    request,
+                    rng=random.Random(SEED),
+                    cut_policy=CutPolicy(),
+                    superb_policy=SuperbPolicy(max_rolls=1),
+                )
+                exact = value_distribution(base, band, skill, dice_sides=retainer.dice_sides)
+                self.assert_matches_exact(result, exact, GEMS)
+                (group,) = result.groups
+                self.assertEqual(group.count, GEMS)
+                self.assertEqual(sum(group.value_counts.values()), GEMS)
+                self.assertEqual(group.ruined_count, group.value_counts.get(0, 0))
+                self.assertEqual(sum(v * n for v, n in group.value_counts.items()), group.total_final_value_sp)
+                for value, n in group.value_counts.items():
+                    p = exact.outcomes[value]
+                    self.assertLess(abs(n / GEMS - p), 5 * math.sqrt(p * (1 - p) / GEMS) + 1 / GEMS)
+
+    def test_fallback_policy_matches_exact_distribution(self):
+        request = _identical_request(FALLBACK_GEMS)
+        base = GEM_CATALOG.by_name("Amethyst").base_sp_by_size["Average"]
+        retainer = _retainer("Superb")
+        result = process_batch_aggregate(
+            retainer,
+            request,
+            rng=random.Random(SEED),
+            cut_policy=CutPolicy(),
+            superb_policy=SuperbPolicy(max_rolls=3),
+        )
+        exact = value_distribution(
+            base, DEFAULT_LADDER.band(base), "Superb", dice_sides=retainer.dice_sides, superb_max_rolls=3
+        )
+        self.assert_matches_exact(result, exact, FALLBACK_GEMS)
+
+    def test_totals_match_expanded_rows(self):
+        request = _identical_request(2_000)
+        result = process_batch_aggregate(
+            _retainer("Superb"), request, rng=random.Random(SEED), cut_policy=CutPolicy(), superb_policy=SuperbPolicy()
+        )
+        rows = result.gem_results
+        self.assertEqual(len(rows), 2_000)
+        self.assertEqual(sum(r.final_value_sp for r in rows), result.total_final_value_sp)
+        self.assertEqual(sum(r.surcharge_sp for r in rows), result.total_surcharge_sp)
+        self.assertEqual(sum(1 for r in rows if r.final_value_sp == 0), result.ruined_count)
+
+    def test_unappraised_batches_match_process_batch(self):
+        rng = random.Random(SEED)
+        mixed = [GEM_CATALOG.entries[rng.randrange(len(GEM_CATALOG.entries))].plan() for _ in range(3_000)]
+        for label, request in (
+            ("identical", _identical_request(3_000, appraise=False, size_label="Large")),
+            (
+                "mixed",
+                BatchRequest(
+                    batch_size=len(mixed),
+                    category="mixed",
+                    size_label="Small",
+                    size_modifier=SIZE_MODIFIERS["Small"],
+                    gem_plans=mixed,
+                    appraise=False,
+                ),
+            ),
+        ):
+            with self.subTest(batch=label):
+                aggregate = process_batch_aggregate(RetainerState(), request, rng=random.Random(SEED))
+                rolled = process_batch(RetainerState(), request, rng=random.Random(SEED))
+                self.assertEqual(aggregate.total_final_value_sp, rolled.total_final_value_sp)
+                self.assertEqual(aggregate.total_surcharge_sp, rolled.total_surcharge_sp)
+                self.assertEqual(aggregate.ruined_count, rolled.ruined_count)
+                self.assertEqual(sum(group.count for group in aggregate.groups), len(request.gem_plans))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""Seeded equivalence of the iter_batch loops.
+
+``iter_batch`` picks a loop from its arguments: the hookless fast path when
+there are no hooks and the providers are policies, the hooked loop
+otherwise, and the instrumented loop when timings are requested. All of
+them must roll the same dice in the same order and build equal results.
+"""
+import random
+import unittest
+
+import core
+from core import (
+    GEM_CATALOG,
+    BatchInstrumentation,
+    BatchRequest,
+    BatchTotals,
+    CutPolicy,
+    DiceSource,
+    GemPlan,
+    RetainerRequest,
+    RetainerState,
+    SuperbPolicy,
+    hire_retainer,
+    iter_batch,
+    process_batch,
+)
+
+SEEDS = (1, 7, 20240601)
+SKILLS = ("Shaky", "Fair", "Good", "Superb")
+CUT_POLICIES = (None, CutPolicy(), CutPolicy(below_value_sp=20_000), CutPolicy(qualities=("Good", "Average")))
+SUPERB_POLICIES = (None, SuperbPolicy(max_rolls=1), SuperbPolicy(max_rolls=4), SuperbPolicy(stop_at_value_sp=50_000))
+
+
+def _retainer(skill):
+    request = RetainerRequest(race="Gnome", months=1, knows_skill_level=True, known_skill_level=skill)
+    return hire_retainer(RetainerState(), request, rng=random.Random(0)).state
+
+
+def _plans(count, seed):
+    rng = random.Random(seed)
+    entries = GEM_CATALOG.entries
+    plans = [entries[rng.randrange(len(entries))].plan() for _ in range(count)]
+    # A custom plan that is not in the catalog takes the uncached pricing path.
+    plans[count // 2] = GemPlan(name="Glass Bead", color="green", base_gp=3.5)
+    return plans
+
+
+def _request(plans, appraise, size_label="Large"):
+    return BatchRequest(
+        batch_size=len(plans),
+        category="mixed",
+        size_label=size_label,
+        size_modifier=core.SIZE_MODIFIERS[size_label],
+        gem_plans=plans,
+        appraise=appraise,
+    )
+
+
+def _no_op(_ctx):
+    pass
+
+
+class HooklessMatchesHookedTest(unittest.TestCase):
+    def assert_same_batches(self, first, second):
+        self.assertEqual(first.gem_results, second.gem_results)
+        self.assertEqual(first.total_final_value_sp, second.total_final_value_sp)
+        self.assertEqual(first.total_surcharge_sp, second.total_surcharge_sp)
+        self.assertEqual(first.total_fees_sp, second.total_fees_sp)
+        self.assertEqual(first.ruined_count, second.ruined_count)
+
+    def test_appraised_batches(self):
+        for seed in SEEDS:
+            plans = _plans(300, seed)
+            for skill in SKILLS:
+                retainer = _retainer(skill)
+                for cut_policy in CUT_POLICIES:
+                    for superb_policy in SUPERB_POLICIES:
+                        with self.subTest(seed=seed, skill=skill, cut=cut_policy, superb=superb_policy):
+                            kwargs = dict(cut_decision_provider=cut_policy, superb_decision_provider=superb_policy)
+                            hookless = process_batch(retainer, _request(plans, True), rng=random.Random(seed), **kwargs)
+                            hooked = process_batch(
+                                retainer,
+                                _request(plans, True),
+                                rng=random.Random(seed),
+                                on_gem_start=_no_op,
+                                **kwargs,
+                            )
+                            self.assert_same_batches(hookless, hooked)
+
+    def test_unappraised_batches(self):
+        for seed in SEEDS:
+            plans = _plans(300, seed)
+            for size_label in core.SIZE_MODIFIERS:
+                with self.subTest(seed=seed, size=size_label):
+                    request = _request(plans, False, size_label)
+                    hookless = process_batch(RetainerState(), request, rng=random.Random(seed))
+                    hooked = process_batch(RetainerState(), request, rng=random.Random(seed), on_gem_start=_no_op)
+                    self.assert_same_batches(hookless, hooked)
+
+    def test_policy_matches_equivalent_callback(self):
+        retainer = _retainer("Good")
+        plans = _plans(300, 3)
+        by_policy = process_batch(retainer, _request(plans, True), rng=DiceSource(3), cut_decision_provider=CutPolicy())
+        by_callback = process_batch(
+            retainer,
+            _request(plans, True),
+            rng=DiceSource(3),
+            cut_decision_provider=lambda ctx: True,
+        )
+        self.assert_same_batches(by_policy, by_callback)
+
+    def test_instrumented_matches_hookless(self):
+        for skill in SKILLS:
+            retainer = _retainer(skill)
+            plans = _plans(200, 11)
+            kwargs = dict(cut_decision_provider=CutPolicy(), superb_decision_provider=SuperbPolicy(max_rolls=3))
+            with self.subTest(skill=skill):
+                plain = process_batch(retainer, _request(plans, True), rng=random.Random(11), **kwargs)
+                instrumented = process_batch(
+                    retainer,
+                    _request(plans, True),
+                    rng=random.Random(11),
+                    instrumentation=BatchInstrumentation(),
+                    **kwargs,
+                )
+                self.assert_same_batches(plain, instrumented)
+                self.assertEqual(instrumented.instrumentation.gem_count, len(plans))
+
+    def test_fresh_plan_objects_match_shared_ones(self):
+        retainer = _retainer("Superb")
+        plans = _plans(300, 5)
+        kwargs = dict(cut_decision_provider=CutPolicy(), superb_decision_provider=SuperbPolicy(max_rolls=2))
+        shared = list(iter_batch(retainer, _request(plans, True), rng=random.Random(5), **kwargs))
+        fresh = (GemPlan(plan.name, plan.color, plan.base_gp, plan.gem_id) for plan in plans)
+        request = BatchRequest(
+            batch_size=len(plans),
+            category="mixed",
+            size_label="Large",
+            size_modifier=core.SIZE_MODIFIERS["Large"],
+            gem_plans=fresh,
+            appraise=True,
+        )
+        totals = BatchTotals()
+        streamed = list(iter_batch(retainer, request, rng=random.Random(5), totals=totals, **kwargs))
+        self.assertEqual(shared, streamed)
+        self.assertEqual(totals.gem_count, len(plans))
+
+    def test_plan_count_must_match_batch_size(self):
+        plans = _plans(10, 2)
+        for hooks in ({}, {"on_gem_start": _no_op}):
+            with self.subTest(hooks=bool(hooks)):
+                too_few = BatchRequest(
+                    batch_size=11,
+                    category="mixed",
+                    size_label="Average",
+                    size_modifier=1.0,
+                    gem_plans=iter(plans),
+                    appraise=False,
+                )
+                with self.assertRaises(ValueError):
+                    list(iter_batch(RetainerState(), too_few, rng=random.Random(2), **hooks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Interrupting a checkpointed batch and resuming it changes nothing."""
+import os
+import random
+import tempfile
+import unittest
+from dataclasses import asdict, replace
+
+from core import (
+    GEM_CATALOG,
+    BatchRequest,
+    BatchTotals,
+    Checkpointer,
+    CutPolicy,
+    DiceSource,
+    RetainerRequest,
+    RetainerState,
+    SuperbPolicy,
+    hire_retainer,
+    iter_batch,
+    iter_batch_checkpointed,
+    load_checkpoint,
+)
+
+BATCH_SIZE = 3000
+STOP_AT = 2000
+CHECKPOINT_EVERY = 777
+
+
+def _retainer(skill):
+    request = RetainerRequest(race="Dwarf", months=1, knows_skill_level=True, known_skill_level=skill)
+    return hire_retainer(RetainerState(), request, rng=random.Random(0)).state
+
+
+def _request():
+    rng = random.Random(4)
+    entries = GEM_CATALOG.entries
+    plans = [entries[rng.randrange(len(entries))].plan() for _ in range(BATCH_SIZE)]
+    return BatchRequest(
+        batch_size=BATCH_SIZE,
+        category="mixed",
+        size_label="Large",
+        size_modifier=1.5,
+        gem_plans=plans,
+        appraise=True,
+    )
+
+
+class CheckpointResumeTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".checkpoint")
+        os.close(handle)
+        self.addCleanup(os.unlink, self.path)
+
+    def test_resume_matches_uninterrupted_run(self):
+        kwargs = dict(cut_decision_provider=CutPolicy(), superb_decision_provider=SuperbPolicy(max_rolls=3))
+        for make_dice in (random.Random, DiceSource):
+            for skill in ("Good", "Superb"):
+                with self.subTest(dice=make_dice.__name__, skill=skill):
+                    retainer = _retainer(skill)
+                    request = _request()
+                    straight_totals = BatchTotals()
+                    straight = [
+                        asdict(result)
+                        for result in iter_batch(retainer, request, rng=make_dice(9), totals=straight_totals, **kwargs)
+                    ]
+
+                    checkpointer = Checkpointer(self.path, every_n=CHECKPOINT_EVERY, every_s=None)
+                    interrupted = []
+                    for result in iter_batch_checkpointed(
+                        retainer, request, rng=make_dice(9), checkpointer=checkpointer, **kwargs
+                    ):
+                        interrupted.append(asdict(result))
+                        if len(interrupted) == STOP_AT:
+                            break
+                    checkpoint = load_checkpoint(self.path)
+                    self.assertEqual(checkpoint.gems_done, STOP_AT // CHECKPOINT_EVERY * CHECKPOINT_EVERY)
+
+                    # A fresh process would start from new dice and a new totals object.
+                    resumed = interrupted[: checkpoint.gems_done]
+                    totals = BatchTotals()
+                    for result in iter_batch_checkpointed(
+                        RetainerState(),
+                        request,
+                        rng=make_dice(12345),
+                        checkpointer=Checkpointer(self.path, every_n=CHECKPOINT_EVERY, every_s=None),
+                        resume=checkpoint,
+                        totals=totals,
+                        **kwargs,
+                    ):
+                        resumed.append(asdict(result))
+
+                    self.assertEqual(resumed, straight)
+                    self.assertEqual(asdict(totals), asdict(straight_totals))
+
+    def test_checkpoint_from_a_larger_batch_is_rejected(self):
+        request = replace(_request(), appraise=False)
+        checkpointer = Checkpointer(self.path, every_n=10, every_s=None)
+        for _ in zip(range(20), iter_batch_checkpointed(RetainerState(), request, rng=random.Random(1), checkpointer=checkpointer)):
+            pass
+        small = replace(request, batch_size=5, gem_plans=request.gem_plans[:5])
+        with self.assertRaises(ValueError):
+            list(
+                iter_batch_checkpointed(
+                    RetainerState(), small, rng=random.Random(1), checkpointer=checkpointer, resume=load_checkpoint(self.path)
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Headless job runner: job specs turn into the policies they describe."""
+import io
+import json
+import unittest
+
+from gem_calculator_v15 import run_jobs
+
+SUPERB_JOB = {
+    "category": "Jewels",
+    "size": "Large",
+    "count": 200,
+    "gems": "roll each",
+    "retainer": {"race": "Gnome", "months": 1, "skill": "Superb"},
+    "auto_cut": True,
+}
+
+
+def _gem_records(job):
+    out = io.StringIO()
+    errors = run_jobs([json.dumps(job)], out, seed=3)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert errors == 0, records
+    return [record for record in records if record["type"] == "gem"]
+
+
+class SuperbStopTest(unittest.TestCase):
+    def test_target_alone_rolls_past_the_first_result(self):
+        target_only = _gem_records(dict(SUPERB_JOB, superb_stop={"target_gp": 1_000_000}))
+        one_roll = _gem_records(dict(SUPERB_JOB, superb_stop={"target_gp": 1_000_000, "max_rolls": 1}))
+        self.assertTrue(any(len(gem["superb_rolls"]) > 1 for gem in target_only))
+        self.assertTrue(all(len(gem["superb_rolls"]) <= 1 for gem in one_roll))
+
+    def test_no_target_rolls_once(self):
+        gems = _gem_records(dict(SUPERB_JOB, superb_stop={}))
+        self.assertTrue(any(gem["superb_rolls"] for gem in gems))
+        self.assertTrue(all(len(gem["superb_rolls"]) <= 1 for gem in gems))
+
+    def test_max_rolls_caps_a_target(self):
+        gems = _gem_records(dict(SUPERB_JOB, superb_stop={"target_gp": 1_000_000, "max_rolls": 2}))
+        self.assertTrue(all(len(gem["superb_rolls"]) <= 2 for gem in gems))
+        self.assertTrue(any(len(gem["superb_rolls"]) == 2 for gem in gems))
+
+
+class JobErrorTest(unittest.TestCase):
+    def test_malformed_policy_gives_an_error_line(self):
+        out = io.StringIO()
+        job = dict(SUPERB_JOB, cut_policy={"type": "cut", "below_value_sp": "abc"})
+        errors = run_jobs([json.dumps(job), json.dumps(SUPERB_JOB)], out, seed=3)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(errors, 1)
+        self.assertEqual(records[0]["type"], "error")
+        self.assertIn("below_value_sp", records[0]["error"])
+        self.assertEqual(records[-1]["type"], "batch")
+
+
+if __name__ == "__main__":
+    unittest.main()
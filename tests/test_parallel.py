@@ -0,0 +1,72 @@
+"""process_batch_parallel results do not depend on the number of workers."""
+import random
+import unittest
+from dataclasses import asdict
+
+from core import (
+    DEFAULT_SHARD_SIZE,
+    GEM_CATALOG,
+    BatchObserver,
+    BatchRequest,
+    CutPolicy,
+    RetainerRequest,
+    RetainerState,
+    SuperbPolicy,
+    hire_retainer,
+    process_batch_parallel,
+)
+
+SHARD_SIZE = 250
+GEMS = 4 * SHARD_SIZE + 37
+
+
+def _request(count):
+    rng = random.Random(7)
+    entries = GEM_CATALOG.entries
+    return BatchRequest(
+        batch_size=count,
+        category="mixed",
+        size_label="Average",
+        size_modifier=1.0,
+        gem_plans=[entries[rng.randrange(len(entries))].plan() for _ in range(count)],
+        appraise=True,
+    )
+
+
+class ParallelTest(unittest.TestCase):
+    def test_results_do_not_depend_on_workers(self):
+        retainer = hire_retainer(
+            RetainerState(),
+            RetainerRequest(race="Gnome", months=1, knows_skill_level=True, known_skill_level="Superb"),
+            rng=random.Random(0),
+        ).state
+        kwargs = dict(
+            seed=7,
+            shard_size=SHARD_SIZE,
+            cut_decision_provider=CutPolicy(),
+            superb_decision_provider=SuperbPolicy(max_rolls=3),
+        )
+        request = _request(GEMS)
+        chunks = []
+        single = process_batch_parallel(
+            retainer, request, workers=1, observer=BatchObserver(lambda chunk, totals: chunks.append(len(chunk)), every_ms=None), **kwargs
+        )
+        pooled = process_batch_parallel(retainer, request, workers=4, **kwargs)
+        self.assertEqual(asdict(single), asdict(pooled))
+        self.assertEqual([r.index for r in single.gem_results], list(range(1, GEMS + 1)))
+        self.assertEqual(sum(chunks), GEMS)
+
+    def test_default_shard_size(self):
+        retainer = hire_retainer(
+            RetainerState(),
+            RetainerRequest(race="Dwarf", months=1, knows_skill_level=True, known_skill_level="Good"),
+            rng=random.Random(0),
+        ).state
+        request = _request(DEFAULT_SHARD_SIZE + 1)
+        kwargs = dict(seed=3, cut_decision_provider=CutPolicy())
+        single = process_batch_parallel(retainer, request, workers=1, **kwargs)
+        pooled = process_batch_parallel(retainer, request, workers=2, **kwargs)
+        self.assertEqual(asdict(single), asdict(pooled))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""CutPolicy / SuperbPolicy validation and round trips."""
+import unittest
+
+from core import CutPolicy, SuperbPolicy, policy_from_dict
+
+
+class PolicyFromDictTest(unittest.TestCase):
+    def test_round_trip(self):
+        for policy in (
+            CutPolicy(),
+            CutPolicy(enabled=False),
+            CutPolicy(below_value_sp=20_000, qualities=("Good", "Average")),
+            SuperbPolicy(),
+            SuperbPolicy(stop_at_value_sp=40_000, max_rolls=6),
+            SuperbPolicy(optimal=True, surcharge_rate=0.1, risk_aversion=0.5),
+        ):
+            with self.subTest(policy=policy):
+                self.assertEqual(policy_from_dict(policy.to_dict()), policy)
+
+    def test_malformed_cut_policies_are_rejected(self):
+        for data in (
+            {"qualities": "Good"},
+            {"qualities": ["Good", "Shiny"]},
+            {"enabled": "false"},
+            {"enabled": 0},
+            {"below_value_sp": "abc"},
+            {"below_value_sp": 2.5},
+            {"below_value_sp": True},
+        ):
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    CutPolicy.from_dict(data)
+
+    def test_malformed_superb_policies_are_rejected(self):
+        for data in (
+            {"stop_at_value_sp": "40000"},
+            {"max_rolls": "3"},
+            {"max_rolls": 0},
+            {"max_rolls": 1.5},
+            {"optimal": "yes"},
+            {"surcharge_rate": "0.1"},
+            {"risk_aversion": None},
+        ):
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    SuperbPolicy.from_dict(data)
+
+    def test_error_names_the_field(self):
+        with self.assertRaisesRegex(ValueError, "enabled"):
+            CutPolicy.from_dict({"enabled": "false"})
+        with self.assertRaisesRegex(ValueError, "qualities"):
+            CutPolicy.from_dict({"qualities": "Good"})
+        with self.assertRaisesRegex(ValueError, "below_value_sp"):
+            CutPolicy.from_dict({"below_value_sp": "abc"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Alias-table chain samplers against the exact distributions and the rolled loop."""
+import math
+import random
+import unittest
+from collections import Counter
+
+import core
+from core import (
+    DEFAULT_LADDER,
+    GEM_CATALOG,
+    BatchRequest,
+    CutPolicy,
+    RetainerRequest,
+    RetainerState,
+    SuperbPolicy,
+    appraisal_sampler,
+    hire_retainer,
+    process_batch,
+    process_batch_sampled,
+    superb_sampler,
+    value_distribution,
+)
+
+DRAWS = 100_000
+GEMS = 10_000
+SEED = 21
+
+
+def _base_and_band(name="Amethyst", size_label="Average"):
+    base = GEM_CATALOG.by_name(name).base_sp_by_size[size_label]
+    return base, DEFAULT_LADDER.band(base)
+
+
+def _superb_retainer():
+    request = RetainerRequest(race="Gnome", months=1, knows_skill_level=True, known_skill_level="Superb")
+    return hire_retainer(RetainerState(), request, rng=random.Random(0)).state
+
+
+class SamplerTest(unittest.TestCase):
+    def assert_frequencies_match(self, samples, probabilities, draws):
+        counts = Counter(samples)
+        self.assertLessEqual(set(counts), set(probabilities))
+        for value, p in probabilities.items():
+            tolerance = 5 * math.sqrt(p * (1 - p) / draws) + 1 / draws
+            self.assertLess(abs(counts[value] / draws - p), tolerance, value)
+
+    def test_appraisal_sampler_matches_exact_distribution(self):
+        base, band = _base_and_band()
+        sampler = appraisal_sampler(base, band)
+        self.assertAlmostEqual(math.fsum(sampler.probabilities), 1.0, places=12)
+        rng = random.Random(SEED)
+        samples = [sampler.values[sampler.sample(rng)] for _ in range(DRAWS)]
+        self.assert_frequencies_match(samples, value_distribution(base, band).outcomes, DRAWS)
+
+    def test_superb_sampler_matches_exact_cut_outcomes(self):
+        base, band = _base_and_band()
+        for policy, max_rolls in ((SuperbPolicy(), None), (SuperbPolicy(max_rolls=1), 1)):
+            with self.subTest(policy=policy):
+                sampler = superb_sampler(base, band, policy)
+                exact = core._cut_outcomes(base, band, "Superb", 20, None, max_rolls)
+                by_value = Counter()
+                for value, p in zip(sampler.final_values, sampler.probabilities):
+                    by_value[value] += p
+                self.assertEqual(set(by_value), set(exact))
+                for value, p in exact.items():
+                    self.assertAlmostEqual(by_value[value], float(p), places=12)
+                rng = random.Random(SEED)
+                samples = [sampler.final_values[sampler.sample(rng)] for _ in range(DRAWS)]
+                self.assert_frequencies_match(samples, {v: float(p) for v, p in exact.items()}, DRAWS)
+
+    def test_sampled_batch_matches_exact_and_rolled_loop(self):
+        entry = GEM_CATALOG.by_name("Amethyst")
+        base, band = _base_and_band()
+        retainer = _superb_retainer()
+        request = BatchRequest(
+            batch_size=GEMS,
+            category=entry.category,
+            size_label="Average",
+            size_modifier=1.0,
+            gem_plans=[entry.plan()] * GEMS,
+            appraise=True,
+        )
+        for policy, max_rolls in ((SuperbPolicy(), None), (SuperbPolicy(max_rolls=1), 1)):
+            with self.subTest(policy=policy):
+                exact = value_distribution(base, band, "Superb", dice_sides=retainer.dice_sides, superb_max_rolls=max_rolls)
+                sampled = process_batch_sampled(
+                    retainer, request, rng=random.Random(SEED), cut_policy=CutPolicy(), superb_policy=policy
+                )
+                rolled = process_batch(
+                    retainer,
+                    request,
+                    rng=random.Random(SEED),
+                    cut_decision_provider=CutPolicy(),
+                    superb_decision_provider=policy,
+                )
+                standard_error = exact.std_dev_sp / math.sqrt(GEMS)
+                sampled_mean = sampled.total_final_value_sp / GEMS
+                rolled_mean = rolled.total_final_value_sp / GEMS
+                self.assertLess(abs(sampled_mean - exact.expected_value_sp), 4 * standard_error)
+                self.assertLess(abs(rolled_mean - exact.expected_value_sp), 4 * standard_error)
+                self.assertLess(abs(sampled_mean - rolled_mean), 4 * math.sqrt(2) * standard_error)
+                p = exact.ruin_probability
+                self.assertLess(abs(sampled.ruined_count / GEMS - p), 4 * math.sqrt(p * (1 - p) / GEMS) + 1e-9)
+                self.assertEqual(sum(r.final_value_sp for r in sampled.gem_results), sampled.total_final_value_sp)
+
+    def test_rebuilt_rolls_replay_to_the_sampled_outcome(self):
+        base, band = _base_and_band()
+        sampler = appraisal_sampler(base, band)
+        rng = random.Random(SEED)
+        for _ in range(200):
+            index = sampler.sample(rng)
+            rolls = sampler.rolls(index, rng)
+            value, quality, replayed = core.adjust_value(
+                base, band[0], band[1], rng=_Faces(rolls, sampler.outcomes[index][2])
+            )
+            self.assertEqual(replayed, rolls)
+            self.assertEqual(value, sampler.values[index])
+
+
+class _Faces:
+    """Dice that replay fixed d10 faces, then the bonus or penalty percent."""
+
+    def __init__(self, faces, percent):
+        self.faces = list(faces)
+        self.percent = percent
+
+    def randint(self, low, high):
+        if low == 1 and high == 10 and self.faces:
+            return self.faces.pop(0)
+        return self.percent
+
+
+if __name__ == "__main__":
+    unittest.main()
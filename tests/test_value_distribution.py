@@ -0,0 +1,94 @@
+"""The exact outcome distribution against the rolled batch loop."""
+import math
+import random
+import unittest
+from fractions import Fraction
+
+import core
+from core import (
+    CUTTING_TABLES,
+    DEFAULT_LADDER,
+    GEM_CATALOG,
+    BatchRequest,
+    CutPolicy,
+    RetainerRequest,
+    RetainerState,
+    SuperbPolicy,
+    hire_retainer,
+    process_batch,
+    value_distribution,
+)
+
+GEMS = 20_000
+SEED = 8
+
+
+def _retainer(skill):
+    request = RetainerRequest(race="Dwarf", months=1, knows_skill_level=True, known_skill_level=skill)
+    return hire_retainer(RetainerState(), request, rng=random.Random(0)).state
+
+
+def _entry():
+    return GEM_CATALOG.by_name("Amethyst")
+
+
+class ValueDistributionTest(unittest.TestCase):
+    def test_probabilities_sum_to_one_exactly(self):
+        base = _entry().base_sp_by_size["Average"]
+        band = DEFAULT_LADDER.band(base)
+        appraisal = core._appraisal_outcomes(base, band, DEFAULT_LADDER)
+        self.assertEqual(sum(p for _, p in appraisal), 1)
+        self.assertTrue(all(isinstance(p, Fraction) for _, p in appraisal))
+        for skill in CUTTING_TABLES:
+            sides = 20 if skill == "Superb" else 12
+            for max_rolls in (1, 3, None):
+                with self.subTest(skill=skill, max_rolls=max_rolls):
+                    total = Fraction(0)
+                    for value, p in appraisal:
+                        cut = core._cut_outcomes(value, band, skill, sides, None, max_rolls)
+                        self.assertEqual(sum(cut.values()), 1)
+                        total += p * sum(cut.values())
+                    self.assertEqual(total, 1)
+                    dist = value_distribution(base, band, skill, dice_sides=sides, superb_max_rolls=max_rolls)
+                    self.assertAlmostEqual(math.fsum(dist.outcomes.values()), 1.0, places=12)
+
+    def test_matches_seeded_process_batch(self):
+        entry = _entry()
+        request = BatchRequest(
+            batch_size=GEMS,
+            category=entry.category,
+            size_label="Average",
+            size_modifier=1.0,
+            gem_plans=[entry.plan()] * GEMS,
+            appraise=True,
+        )
+        base = entry.base_sp_by_size["Average"]
+        band = DEFAULT_LADDER.band(base)
+        for skill in CUTTING_TABLES:
+            with self.subTest(skill=skill):
+                retainer = _retainer(skill)
+                result = process_batch(
+                    retainer,
+                    request,
+                    rng=random.Random(SEED),
+                    cut_decision_provider=CutPolicy(),
+                    superb_decision_provider=SuperbPolicy(max_rolls=1),
+                )
+                exact = value_distribution(base, band, skill, dice_sides=retainer.dice_sides)
+                mean = result.total_final_value_sp / GEMS
+                self.assertLess(abs(mean - exact.expected_value_sp), 4 * exact.std_dev_sp / math.sqrt(GEMS))
+                p = exact.ruin_probability
+                ruin_rate = result.ruined_count / GEMS
+                self.assertLess(abs(ruin_rate - p), 4 * math.sqrt(p * (1 - p) / GEMS) + 1e-9)
+
+    def test_appraisal_only_matches_unappraised_cut(self):
+        base = _entry().base_sp_by_size["Average"]
+        band = DEFAULT_LADDER.band(base)
+        appraisal_only = value_distribution(base, band)
+        not_cut = value_distribution(base, band, "Good", cut=False)
+        self.assertEqual(appraisal_only, not_cut)
+        self.assertEqual(appraisal_only.ruin_probability, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()